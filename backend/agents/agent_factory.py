@@ -1,32 +1,118 @@
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Set, Type
+from collections import defaultdict, deque
 import asyncio
+import importlib
 import logging
+import httpx
+import orjson
 from .base.base_agent import BaseAgent
-from .specialized import (
-    FraudDetectionAgent,
-    SimSwapAgent,
-    KYCMatchAgent,
-    DeviceLocationAgent,
-    ScamSignalAgent
-)
 
 
 class AgentFactory:
     """
     Factory class for creating and managing specialized agents
     Provides centralized agent instantiation and lifecycle management
+    
+    With lazy_init enabled, created agents are registered without being
+    initialized; each one initializes on its first request or via warm().
     """
     
-    def __init__(self):
+    def __init__(self, lazy_init: bool = True):
         self.logger = logging.getLogger(__name__)
+        self.lazy_init = lazy_init
         self.agent_registry: Dict[str, BaseAgent] = {}
-        self.agent_classes = {
-            "fraud_detection": FraudDetectionAgent,
-            "sim_swap": SimSwapAgent,
-            "kyc_match": KYCMatchAgent,
-            "device_location": DeviceLocationAgent,
-            "scam_signal": ScamSignalAgent
+        # Agent type -> dotted class path, imported only when first needed
+        self.agent_classes: Dict[str, str] = {
+            "fraud_detection": "specialized.fraud_detection_agent.FraudDetectionAgent",
+            "sim_swap": "specialized.sim_swap_agent.SimSwapAgent",
+            "kyc_match": "specialized.kyc_match_agent.KYCMatchAgent",
+            "device_location": "specialized.device_location_agent.DeviceLocationAgent",
+            "scam_signal": "specialized.scam_signal_agent.ScamSignalAgent"
         }
+        self._resolved_classes: Dict[str, Type[BaseAgent]] = {}
+        
+        # Shared HTTP client for registry traffic from all agents
+        self.registry_url = "http://localhost:8000"
+        self.http_client: Optional[httpx.AsyncClient] = None
+        
+        # Single batched heartbeat for all agents instead of one loop per agent
+        self.heartbeat_interval = 30
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._shutdown_event: Optional[asyncio.Event] = None
+        
+        # Reusable instances of shut down agents, keyed by agent type
+        self.max_pool_size = 4
+        self._pools: Dict[str, deque] = {agent_type: deque() for agent_type in self.agent_classes}
+        self._agent_types: Dict[str, str] = {}
+        self._agents_by_type: Dict[str, List[str]] = {agent_type: [] for agent_type in self.agent_classes}
+        
+        # Inverted index of capability -> ids of registered agents providing it
+        self._capability_index: Dict[str, Set[str]] = defaultdict(set)
+        
+        # Static agent metadata, built once per agent type
+        self._metadata_cache: Dict[str, Dict[str, any]] = {}
+        
+    def _get_http_client(self) -> httpx.AsyncClient:
+        """Get the shared HTTP client, creating it on first use"""
+        if self.http_client is None or self.http_client.is_closed:
+            self.http_client = httpx.AsyncClient(
+                timeout=30.0,
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64)
+            )
+        return self.http_client
+        
+    async def aclose(self) -> None:
+        """Close the shared HTTP client"""
+        if self.http_client is not None:
+            await self.http_client.aclose()
+            self.http_client = None
+        
+    def _get_agent_class(self, agent_type: str) -> Type[BaseAgent]:
+        """Import and return the agent class for an agent type"""
+        agent_class = self._resolved_classes.get(agent_type)
+        if agent_class is None:
+            module_path, class_name = self.agent_classes[agent_type].rsplit(".", 1)
+            module = importlib.import_module(f".{module_path}", __package__)
+            agent_class = self._resolved_classes[agent_type] = getattr(module, class_name)
+        return agent_class
+        
+    def _start_heartbeat(self) -> None:
+        """Start the factory heartbeat task if it is not already running"""
+        if self._heartbeat_task is None or self._heartbeat_task.done():
+            self._shutdown_event = asyncio.Event()
+            self._heartbeat_task = asyncio.create_task(self._heartbeat_all())
+            
+    async def _stop_heartbeat(self) -> None:
+        """Stop the factory heartbeat task"""
+        if self._shutdown_event:
+            self._shutdown_event.set()
+        if self._heartbeat_task:
+            await self._heartbeat_task
+            self._heartbeat_task = None
+            
+    async def _heartbeat_all(self) -> None:
+        """Send one batched heartbeat for all initialized agents per interval"""
+        while not self._shutdown_event.is_set():
+            payload = [
+                agent.build_heartbeat_payload()
+                for agent in self.agent_registry.values()
+                if agent.initialized
+            ]
+            
+            if payload:
+                try:
+                    await self._get_http_client().post(
+                        f"{self.registry_url}/mcp/agents/heartbeat_batch",
+                        content=orjson.dumps(payload),
+                        headers={"content-type": "application/json"}
+                    )
+                except Exception as e:
+                    self.logger.debug(f"Batch heartbeat failed: {e}")
+            
+            try:
+                await asyncio.wait_for(self._shutdown_event.wait(), timeout=self.heartbeat_interval)
+            except asyncio.TimeoutError:
+                continue
         
     async def create_agent(self, agent_type: str) -> Optional[BaseAgent]:
         """Create and initialize a new agent instance"""
@@ -35,17 +121,25 @@ class AgentFactory:
             return None
             
         try:
-            agent_class = self.agent_classes[agent_type]
-            agent = agent_class()
-            
-            # Initialize the agent
-            success = await agent.initialize()
-            if not success:
-                self.logger.error(f"Failed to initialize {agent_type} agent")
-                return None
+            pool = self._pools[agent_type]
+            agent = pool.popleft() if pool else self._get_agent_class(agent_type)()
+            agent.http_client = self._get_http_client()
+            agent.heartbeat_enabled = False
+            
+            # Initialize the agent now unless it is deferred to first use
+            if not self.lazy_init:
+                success = await agent.initialize()
+                if not success:
+                    self.logger.error(f"Failed to initialize {agent_type} agent")
+                    return None
                 
             # Register the agent
             self.agent_registry[agent.agent_id] = agent
+            self._agent_types[agent.agent_id] = agent_type
+            self._agents_by_type[agent_type].append(agent.agent_id)
+            for capability in agent.capabilities:
+                self._capability_index[capability].add(agent.agent_id)
+            self._start_heartbeat()
             self.logger.info(f"Created and registered {agent_type} agent: {agent.agent_id}")
             
             return agent
@@ -54,25 +148,44 @@ class AgentFactory:
             self.logger.error(f"Error creating {agent_type} agent: {e}")
             return None
             
+    async def warm(self, agent_type: str) -> bool:
+        """Initialize all registered agents of a type ahead of their first request"""
+        agents = [self.agent_registry[agent_id] for agent_id in self._agents_by_type.get(agent_type, [])]
+        results = await asyncio.gather(*(agent.ensure_initialized() for agent in agents))
+        return all(results)
+            
     async def get_agent(self, agent_id: str) -> Optional[BaseAgent]:
         """Get an existing agent by ID"""
         return self.agent_registry.get(agent_id)
         
     async def get_agents_by_capability(self, capability: str) -> List[BaseAgent]:
         """Get all agents that support a specific capability"""
-        matching_agents = []
-        for agent in self.agent_registry.values():
-            if capability in agent.capabilities:
-                matching_agents.append(agent)
-        return matching_agents
+        return [self.agent_registry[agent_id] for agent_id in self._capability_index.get(capability, ())]
+        
+    async def find_for_task(self, required_capabilities: List[str]) -> List[BaseAgent]:
+        """Get all agents that support every one of the required capabilities"""
+        if not required_capabilities:
+            return []
+        
+        candidate_sets = [self._capability_index.get(c, set()) for c in required_capabilities]
+        matching_ids = set.intersection(*candidate_sets)
+        return [self.agent_registry[agent_id] for agent_id in matching_ids]
         
     async def create_all_agents(self) -> Dict[str, BaseAgent]:
         """Create instances of all available agent types"""
         created_agents = {}
+        agent_types = list(self.agent_classes.keys())
         
-        for agent_type in self.agent_classes.keys():
-            agent = await self.create_agent(agent_type)
-            if agent:
+        # Initialize all agents concurrently so registry round-trips overlap
+        results = await asyncio.gather(
+            *(self.create_agent(agent_type) for agent_type in agent_types),
+            return_exceptions=True
+        )
+        
+        for agent_type, agent in zip(agent_types, results):
+            if isinstance(agent, Exception):
+                self.logger.error(f"Error creating {agent_type} agent: {agent}")
+            elif agent:
                 created_agents[agent_type] = agent
                 
         self.logger.info(f"Created {len(created_agents)} agents: {list(created_agents.keys())}")
@@ -88,6 +201,16 @@ class AgentFactory:
         try:
             await agent.shutdown()
             del self.agent_registry[agent_id]
+            for capability in agent.capabilities:
+                agent_ids = self._capability_index.get(capability)
+                if agent_ids is not None:
+                    agent_ids.discard(agent_id)
+                    if not agent_ids:
+                        del self._capability_index[capability]
+            
+            agent_type = self._agent_types.pop(agent_id)
+            self._agents_by_type[agent_type].remove(agent_id)
+            self._release_to_pool(agent_type, agent)
             self.logger.info(f"Successfully shutdown agent {agent_id}")
             return True
             
@@ -95,12 +218,36 @@ class AgentFactory:
             self.logger.error(f"Error shutting down agent {agent_id}: {e}")
             return False
             
+    def _release_to_pool(self, agent_type: str, agent: BaseAgent) -> None:
+        """Return a shut down instance to its pool for reuse by create_agent"""
+        pool = self._pools[agent_type]
+        if len(pool) < self.max_pool_size:
+            agent.reset()
+            pool.append(agent)
+            
     async def shutdown_all_agents(self) -> None:
         """Shutdown all registered agents"""
-        agent_ids = list(self.agent_registry.keys())
+        agents = [(self._agent_types[agent_id], agent) for agent_id, agent in self.agent_registry.items()]
+        
+        # Clear the registry and its indexes in one pass rather than per agent
+        self.agent_registry.clear()
+        self._agent_types.clear()
+        self._capability_index.clear()
+        for agent_ids in self._agents_by_type.values():
+            agent_ids.clear()
         
-        for agent_id in agent_ids:
-            await self.shutdown_agent(agent_id)
+        results = await asyncio.gather(
+            *(agent.shutdown() for _, agent in agents),
+            return_exceptions=True
+        )
+        
+        for (agent_type, agent), result in zip(agents, results):
+            if isinstance(result, Exception):
+                self.logger.error(f"Error shutting down agent {agent.agent_id}: {result}")
+            else:
+                self._release_to_pool(agent_type, agent)
+        await self._stop_heartbeat()
+        await self.aclose()
             
         self.logger.info("All agents shutdown")
         
@@ -113,19 +260,25 @@ class AgentFactory:
         if agent_type not in self.agent_classes:
             return None
             
-        agent_class = self.agent_classes[agent_type]
-        
-        # Create temporary instance to get metadata (without initialization)
-        temp_agent = agent_class()
-        
-        return {
-            "agent_type": agent_type,
-            "agent_id": temp_agent.agent_id,
-            "name": temp_agent.name,
-            "description": temp_agent.description,
-            "capabilities": temp_agent.capabilities,
-            "endpoint_url": temp_agent.endpoint_url
-        }
+        if agent_type not in self._metadata_cache:
+            agent_class = self._get_agent_class(agent_type)
+            
+            # Create temporary instance to get metadata (without initialization)
+            temp_agent = agent_class()
+            
+            self._metadata_cache[agent_type] = {
+                "agent_type": agent_type,
+                "agent_id": temp_agent.agent_id,
+                "name": temp_agent.name,
+                "description": temp_agent.description,
+                "capabilities": temp_agent.capabilities,
+                "endpoint_url": temp_agent.endpoint_url
+            }
+            
+        # Copy so callers can't modify the cached metadata
+        info = dict(self._metadata_cache[agent_type])
+        info["capabilities"] = list(info["capabilities"])
+        return info
         
     def get_all_agent_info(self) -> Dict[str, Dict[str, any]]:
         """Get information about all available agent types"""
@@ -141,17 +294,23 @@ class AgentFactory:
     async def health_check_all(self) -> Dict[str, Dict[str, any]]:
         """Perform health check on all registered agents"""
         health_results = {}
+        # Snapshot the registry so agents added/removed mid-check don't skew results
+        items = list(self.agent_registry.items())
         
-        for agent_id, agent in self.agent_registry.items():
-            try:
-                health_data = await agent.health_check()
-                health_results[agent_id] = health_data
-            except Exception as e:
+        results = await asyncio.gather(
+            *(agent.health_check() for _, agent in items),
+            return_exceptions=True
+        )
+        
+        for (agent_id, _), health_data in zip(items, results):
+            if isinstance(health_data, Exception):
                 health_results[agent_id] = {
                     "agent_id": agent_id,
                     "status": "error",
-                    "error": str(e)
+                    "error": str(health_data)
                 }
+            else:
+                health_results[agent_id] = health_data
                 
         return health_results
         
@@ -162,11 +321,8 @@ class AgentFactory:
             "agent_ids": list(self.agent_registry.keys()),
             "available_types": self.list_available_agent_types(),
             "agents_by_type": {
-                agent_type: [
-                    agent.agent_id for agent in self.agent_registry.values()
-                    if agent.__class__.__name__.lower().replace('agent', '') == agent_type.replace('_', '')
-                ]
-                for agent_type in self.agent_classes.keys()
+                agent_type: list(agent_ids)
+                for agent_type, agent_ids in self._agents_by_type.items()
             }
         }
 
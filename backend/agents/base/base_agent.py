@@ -1,12 +1,14 @@
 from abc import ABC, abstractmethod
 from typing import Dict, List, Any, Optional, Callable
 import asyncio
+import itertools
 import logging
-import uuid
+import time
 from datetime import datetime
 from enum import Enum
 import json
 import httpx
+import orjson
 
 
 class AgentStatus(Enum):
@@ -25,18 +27,27 @@ class BaseAgent(ABC):
     """
     
     def __init__(self, agent_id: str, name: str, description: str, 
-                 capabilities: List[str], endpoint_url: str = None):
+                 capabilities: List[str], endpoint_url: str = None,
+                 http_client: Optional[httpx.AsyncClient] = None):
         self.agent_id = agent_id
         self.name = name
         self.description = description
         self.capabilities = capabilities
+        self._capabilities_set = frozenset(capabilities)
         self.endpoint_url = endpoint_url or f"http://localhost:8000/agents/{agent_id}"
         
         # Status and monitoring
         self.status = AgentStatus.INITIALIZING
         self.logger = logging.getLogger(f"{__name__}.{self.__class__.__name__}")
         self.created_at = datetime.utcnow()
+        self._created_monotonic_ns = time.monotonic_ns()
         self.last_heartbeat = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._shutdown_event: Optional[asyncio.Event] = None
+        self._initialized = False
+        self._init_lock: Optional[asyncio.Lock] = None
+        self._req_counter = itertools.count()
+        self._inflight = 0
         
         # Performance metrics
         self.metrics = {
@@ -47,6 +58,8 @@ class BaseAgent(ABC):
             "last_request_time": None,
             "uptime_seconds": 0
         }
+        self._total_ms = 0
+        self._metrics_snapshot = dict(self.metrics)  # Refreshed on write, copied into each health_check
         
         # Configuration
         self.config = {}
@@ -54,26 +67,52 @@ class BaseAgent(ABC):
         
         # Communication settings
         self.registry_url = "http://localhost:8000"
-        self.http_client = None
+        self.http_client = http_client
+        self._owns_http_client = False
+        self.heartbeat_enabled = True  # Disabled when a factory heartbeats on the agent's behalf
+        
+        # Registration payload is fixed between resets
+        self._build_registration_payload()
+        
+        # Heartbeat body reused across beats; only status and timestamp change
+        self._heartbeat_template = {
+            "agent_id": self.agent_id,
+            "status": None,
+            "in_flight": 0,
+            "metrics": self.metrics,
+            "timestamp": None
+        }
         
         self.logger.info(f"Initialized agent {self.agent_id} ({self.name})")
     
     async def initialize(self) -> bool:
         """Initialize the agent and register with MCP registry"""
         try:
-            # Initialize HTTP client
-            self.http_client = httpx.AsyncClient(timeout=30.0)
-            
-            # Perform agent-specific initialization
-            await self._initialize_agent()
+            # Initialize HTTP client unless a shared one was injected
+            if self.http_client is None:
+                self.http_client = httpx.AsyncClient(timeout=30.0)
+                self._owns_http_client = True
             
-            # Register with MCP resource registry
-            await self._register_with_registry()
+            # Perform agent-specific initialization and register with the
+            # MCP resource registry concurrently; registration failures are
+            # logged by _register_with_registry and don't fail initialization
+            registration = asyncio.create_task(self._register_with_registry())
+            try:
+                await self._initialize_agent()
+            except Exception:
+                # Don't leave an agent that failed to initialize registered
+                await registration
+                await self._unregister_from_registry()
+                raise
+            await registration
             
             # Start heartbeat
-            asyncio.create_task(self._heartbeat_loop())
+            self._shutdown_event = asyncio.Event()
+            if self.heartbeat_enabled:
+                self._heartbeat_task = asyncio.create_task(self._heartbeat_loop())
             
             self.status = AgentStatus.READY
+            self._initialized = True
             self.logger.info(f"Agent {self.agent_id} initialized successfully")
             return True
             
@@ -82,17 +121,37 @@ class BaseAgent(ABC):
             self.logger.error(f"Failed to initialize agent {self.agent_id}: {e}")
             return False
     
+    async def ensure_initialized(self) -> bool:
+        """Initialize the agent on first use, guarding against concurrent callers"""
+        if self._initialized:
+            return True
+        
+        if self._init_lock is None:
+            self._init_lock = asyncio.Lock()
+        
+        async with self._init_lock:
+            if not self._initialized:
+                await self.initialize()
+        
+        return self._initialized
+    
     async def shutdown(self) -> None:
         """Gracefully shutdown the agent"""
         self.status = AgentStatus.SHUTDOWN
         self.logger.info(f"Shutting down agent {self.agent_id}")
         
+        # Wake the heartbeat loop so it exits immediately
+        if self._shutdown_event:
+            self._shutdown_event.set()
+        if self._heartbeat_task:
+            await self._heartbeat_task
+        
         try:
             # Unregister from registry
             await self._unregister_from_registry()
             
-            # Close HTTP client
-            if self.http_client:
+            # Close HTTP client (shared clients are closed by their owner)
+            if self.http_client and self._owns_http_client:
                 await self.http_client.aclose()
             
             # Agent-specific cleanup
@@ -101,6 +160,36 @@ class BaseAgent(ABC):
         except Exception as e:
             self.logger.error(f"Error during agent shutdown: {e}")
     
+    def reset(self) -> None:
+        """Reset runtime state so a shut down instance can be re-initialized"""
+        if self._heartbeat_task and not self._heartbeat_task.done():
+            self._heartbeat_task.cancel()
+        self._heartbeat_task = None
+        self._shutdown_event = None
+        self._initialized = False
+        
+        if self._owns_http_client:
+            self.http_client = None
+            self._owns_http_client = False
+        
+        self.status = AgentStatus.INITIALIZING
+        self.created_at = datetime.utcnow()
+        self._created_monotonic_ns = time.monotonic_ns()
+        self._build_registration_payload()
+        self.last_heartbeat = None
+        self.config.clear()
+        self.metrics.update({
+            "requests_processed": 0,
+            "success_count": 0,
+            "error_count": 0,
+            "avg_response_time_ms": 0,
+            "last_request_time": None,
+            "uptime_seconds": 0
+        })
+        self._total_ms = 0
+        self._metrics_snapshot = dict(self.metrics)
+        self._reset_agent()
+    
     @abstractmethod
     async def _initialize_agent(self) -> None:
         """Agent-specific initialization logic"""
@@ -111,6 +200,10 @@ class BaseAgent(ABC):
         """Agent-specific cleanup logic"""
         pass
     
+    def _reset_agent(self) -> None:
+        """Agent-specific reset of runtime state such as caches"""
+        pass
+    
     @abstractmethod
     async def execute_capability(self, capability_type: str, 
                                input_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -123,28 +216,30 @@ class BaseAgent(ABC):
         Process an incoming request
         Handles common processing logic, metrics, and error handling
         """
-        request_id = str(uuid.uuid4())
-        start_time = datetime.utcnow()
+        request_id = f"{self.agent_id}-{next(self._req_counter):x}"
+        start_ns = time.monotonic_ns()
         
         self.logger.info(f"Processing request {request_id} for capability {capability_type}")
         
+        self._inflight += 1
         try:
             # Validate capability
-            if capability_type not in self.capabilities:
+            if capability_type not in self._capabilities_set:
                 raise ValueError(f"Capability {capability_type} not supported by this agent")
             
-            # Update status
-            self.status = AgentStatus.PROCESSING
+            # Lazily initialize agents created without eager initialization
+            if not self._initialized and not await self.ensure_initialized():
+                raise RuntimeError(f"Agent {self.agent_id} failed to initialize")
             
             # Execute the capability
             result = await self.execute_capability(capability_type, input_data)
             
             # Calculate metrics
-            end_time = datetime.utcnow()
-            processing_time_ms = int((end_time - start_time).total_seconds() * 1000)
+            processing_time_ms = (time.monotonic_ns() - start_ns) // 1_000_000
+            end_iso = datetime.utcnow().isoformat()
             
             # Update metrics
-            await self._update_metrics(processing_time_ms, success=True)
+            await self._update_metrics(processing_time_ms, success=True, last_request_iso=end_iso)
             
             # Prepare response
             response = {
@@ -154,7 +249,7 @@ class BaseAgent(ABC):
                 "status": "success",
                 "result": result,
                 "processing_time_ms": processing_time_ms,
-                "timestamp": end_time.isoformat(),
+                "timestamp": end_iso,
                 "metadata": {
                     "agent_name": self.name,
                     "version": "1.0.0",
@@ -162,17 +257,16 @@ class BaseAgent(ABC):
                 }
             }
             
-            self.status = AgentStatus.READY
             self.logger.info(f"Request {request_id} completed successfully in {processing_time_ms}ms")
             
             return response
             
         except Exception as e:
             # Handle errors
-            end_time = datetime.utcnow()
-            processing_time_ms = int((end_time - start_time).total_seconds() * 1000)
+            processing_time_ms = (time.monotonic_ns() - start_ns) // 1_000_000
+            end_iso = datetime.utcnow().isoformat()
             
-            await self._update_metrics(processing_time_ms, success=False)
+            await self._update_metrics(processing_time_ms, success=False, last_request_iso=end_iso)
             
             error_response = {
                 "request_id": request_id,
@@ -185,13 +279,27 @@ class BaseAgent(ABC):
                     "code": getattr(e, 'code', 'AGENT_ERROR')
                 },
                 "processing_time_ms": processing_time_ms,
-                "timestamp": end_time.isoformat()
+                "timestamp": end_iso
             }
             
-            self.status = AgentStatus.READY
             self.logger.error(f"Request {request_id} failed: {e}")
             
             return error_response
+            
+        finally:
+            self._inflight -= 1
+    
+    @property
+    def initialized(self) -> bool:
+        """Whether the agent has completed initialization"""
+        return self._initialized
+    
+    @property
+    def current_status(self) -> str:
+        """Status reported externally, reflecting requests currently in flight"""
+        if self._inflight > 0 and self.status == AgentStatus.READY:
+            return AgentStatus.PROCESSING.value
+        return self.status.value
     
     async def health_check(self) -> Dict[str, Any]:
         """Perform health check and return status"""
@@ -200,10 +308,11 @@ class BaseAgent(ABC):
         health_data = {
             "agent_id": self.agent_id,
             "name": self.name,
-            "status": self.status.value,
+            "status": self.current_status,
+            "in_flight": self._inflight,
             "uptime_seconds": uptime,
             "capabilities": self.capabilities,
-            "metrics": self.metrics.copy(),
+            "metrics": dict(self._metrics_snapshot),
             "last_heartbeat": self.last_heartbeat.isoformat() if self.last_heartbeat else None,
             "endpoint_url": self.endpoint_url,
             "timestamp": datetime.utcnow().isoformat()
@@ -222,34 +331,29 @@ class BaseAgent(ABC):
         """Agent-specific health check information"""
         return {}
     
-    async def _update_metrics(self, processing_time_ms: int, success: bool = True) -> None:
+    async def _update_metrics(self, processing_time_ms: int, success: bool = True,
+                              last_request_iso: Optional[str] = None) -> None:
         """Update agent performance metrics"""
         self.metrics["requests_processed"] += 1
-        self.metrics["last_request_time"] = datetime.utcnow().isoformat()
+        self.metrics["last_request_time"] = last_request_iso or datetime.utcnow().isoformat()
         
         if success:
             self.metrics["success_count"] += 1
         else:
             self.metrics["error_count"] += 1
         
-        # Update average response time
-        current_avg = self.metrics["avg_response_time_ms"]
-        total_requests = self.metrics["requests_processed"]
-        
-        if total_requests == 1:
-            self.metrics["avg_response_time_ms"] = processing_time_ms
-        else:
-            # Calculate running average
-            self.metrics["avg_response_time_ms"] = int(
-                (current_avg * (total_requests - 1) + processing_time_ms) / total_requests
-            )
+        # Update average response time from the running total
+        self._total_ms += processing_time_ms
+        self.metrics["avg_response_time_ms"] = self._total_ms // self.metrics["requests_processed"]
         
         # Update uptime
-        self.metrics["uptime_seconds"] = int((datetime.utcnow() - self.created_at).total_seconds())
+        self.metrics["uptime_seconds"] = (time.monotonic_ns() - self._created_monotonic_ns) // 1_000_000_000
+        
+        self._metrics_snapshot = self.metrics.copy()
     
-    async def _register_with_registry(self) -> None:
-        """Register this agent with the MCP resource registry"""
-        registration_data = {
+    def _build_registration_payload(self) -> None:
+        """Build the registration payload and its serialized form"""
+        self._registration_payload = {
             "agent_id": self.agent_id,
             "name": self.name,
             "description": self.description,
@@ -270,12 +374,16 @@ class BaseAgent(ABC):
                 "created_at": self.created_at.isoformat()
             }
         }
-        
+        self._registration_json = orjson.dumps(self._registration_payload)
+    
+    async def _register_with_registry(self) -> None:
+        """Register this agent with the MCP resource registry"""
         try:
             if self.http_client:
                 response = await self.http_client.post(
                     f"{self.registry_url}/mcp/agents/register",
-                    json=registration_data
+                    content=self._registration_json,
+                    headers={"content-type": "application/json"}
                 )
                 response.raise_for_status()
                 self.logger.info(f"Successfully registered agent {self.agent_id} with registry")
@@ -296,32 +404,41 @@ class BaseAgent(ABC):
     
     async def _heartbeat_loop(self) -> None:
         """Send periodic heartbeats to the registry"""
-        while self.status != AgentStatus.SHUTDOWN:
+        while not self._shutdown_event.is_set():
             try:
                 await self._send_heartbeat()
-                await asyncio.sleep(30)  # Heartbeat every 30 seconds
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 self.logger.error(f"Heartbeat error: {e}")
-                await asyncio.sleep(10)  # Retry after 10 seconds on error
+            
+            # Heartbeat every 30 seconds, waking early on shutdown
+            try:
+                await asyncio.wait_for(self._shutdown_event.wait(), timeout=30)
+            except asyncio.TimeoutError:
+                continue
+            except asyncio.CancelledError:
+                break
     
-    async def _send_heartbeat(self) -> None:
-        """Send heartbeat with current metrics"""
+    def build_heartbeat_payload(self) -> Dict[str, Any]:
+        """Refresh and return the heartbeat payload with current metrics"""
         self.last_heartbeat = datetime.utcnow()
         
-        heartbeat_data = {
-            "agent_id": self.agent_id,
-            "status": self.status.value,
-            "metrics": self.metrics,
-            "timestamp": self.last_heartbeat.isoformat()
-        }
+        self._heartbeat_template["status"] = self.current_status
+        self._heartbeat_template["in_flight"] = self._inflight
+        self._heartbeat_template["timestamp"] = self.last_heartbeat
+        return self._heartbeat_template
+    
+    async def _send_heartbeat(self) -> None:
+        """Send heartbeat with current metrics"""
+        heartbeat_data = self.build_heartbeat_payload()
         
         try:
             if self.http_client and self.status != AgentStatus.SHUTDOWN:
                 response = await self.http_client.post(
                     f"{self.registry_url}/mcp/agents/{self.agent_id}/heartbeat",
-                    json=heartbeat_data
+                    content=orjson.dumps(heartbeat_data),
+                    headers={"content-type": "application/json"}
                 )
                 # Don't raise for status on heartbeat failures to avoid disrupting the loop
         except Exception as e:
@@ -336,9 +453,10 @@ class BaseAgent(ABC):
         self.config.update(config_updates)
         self.logger.info(f"Updated configuration for agent {self.agent_id}")
     
-    def get_capability_info(self, capability_type: str) -> Optional[Dict[str, Any]]:
+    def get_capability_info(self, capability_type: str,
+                            now_iso: Optional[str] = None) -> Optional[Dict[str, Any]]:
         """Get information about a specific capability"""
-        if capability_type not in self.capabilities:
+        if capability_type not in self._capabilities_set:
             return None
         
         return {
@@ -352,7 +470,7 @@ class BaseAgent(ABC):
             "output_format": "json",
             "metadata": {
                 "version": "1.0.0",
-                "last_updated": datetime.utcnow().isoformat()
+                "last_updated": now_iso or datetime.utcnow().isoformat()
             }
         }
     
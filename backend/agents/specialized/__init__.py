@@ -1,8 +1,14 @@
-from .fraud_detection_agent import FraudDetectionAgent
-from .sim_swap_agent import SimSwapAgent
-from .kyc_match_agent import KYCMatchAgent
-from .device_location_agent import DeviceLocationAgent
-from .scam_signal_agent import ScamSignalAgent
+import importlib
+
+# Agents are imported on first attribute access (PEP 562) so that importing
+# the package doesn't load every specialized agent module
+_AGENTS = {
+    "FraudDetectionAgent": ("fraud_detection_agent", "FraudDetectionAgent"),
+    "SimSwapAgent": ("sim_swap_agent", "SimSwapAgent"),
+    "KYCMatchAgent": ("kyc_match_agent", "KYCMatchAgent"),
+    "DeviceLocationAgent": ("device_location_agent", "DeviceLocationAgent"),
+    "ScamSignalAgent": ("scam_signal_agent", "ScamSignalAgent")
+}
 
 __all__ = [
     "FraudDetectionAgent",
@@ -10,4 +16,17 @@ __all__ = [
     "KYCMatchAgent",
     "DeviceLocationAgent",
     "ScamSignalAgent"
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    if name in _AGENTS:
+        module_name, class_name = _AGENTS[name]
+        agent_class = getattr(importlib.import_module(f".{module_name}", __name__), class_name)
+        globals()[name] = agent_class
+        return agent_class
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+def __dir__():
+    return sorted(list(globals()) + __all__)
@@ -1,28 +1,255 @@
 from typing import Dict, List, Any, Optional, Tuple
 import asyncio
+import hashlib
+import os
+from bisect import bisect_right
 import httpx
+import orjson
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
 import math
+import warnings
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the NumPy kernel is used without it
+    njit = None
+
+try:
+    import redis.asyncio as aioredis
+except ImportError:  # redis is optional; CAMARA responses are not cached without it
+    aioredis = None
 
 from ..base.base_agent import BaseAgent
 
 
+EARTH_RADIUS_KM = 6371
+
+# TTLs (seconds) for cached CAMARA responses
+LOCATION_CACHE_TTL = 30
+HISTORY_CACHE_TTL = 60
+
+# Circular geofences below this radius use the equirectangular approximation
+EQUIRECTANGULAR_MAX_RADIUS_M = 50_000
+
+# (type, description) of speed anomalies, indexed by "is impossible speed"
+SPEED_ANOMALY_TYPES = (
+    ("high_speed", "Unusually high speed"),
+    ("impossible_speed", "Impossibly high speed")
+)
+
+# Upper bound on cached reference points (expected areas, geofence centres)
+RADIANS_CACHE_SIZE = 1024
+
+
+def _trajectory_kernel_numpy(lats: np.ndarray, lons: np.ndarray,
+                             times_s: np.ndarray) -> Tuple[float, np.ndarray]:
+    """Total distance (km) and per-step speeds (km/h, 0 where unknown) of a track"""
+    # Haversine with one cos(lat) per point, shared by the steps on either side of it
+    lat_rad = np.radians(lats)
+    cos_lat = np.cos(lat_rad)
+    dlat = np.diff(lat_rad)
+    dlon = np.radians(np.diff(lons))
+    
+    a = np.sin(dlat / 2) ** 2 + cos_lat[:-1] * cos_lat[1:] * np.sin(dlon / 2) ** 2
+    distances = 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(a))
+    has_distance = ~np.isnan(distances)
+    total_km = distances[has_distance].sum()
+    
+    time_diff_hours = np.diff(times_s) / 3600
+    has_speed = has_distance & (time_diff_hours > 0)
+    speeds = np.divide(distances, time_diff_hours, out=np.zeros_like(distances), where=has_speed)
+    return total_km, speeds
+
+
+def _trajectory_kernel_loop(lats: np.ndarray, lons: np.ndarray,
+                            times_s: np.ndarray) -> Tuple[float, np.ndarray]:
+    """Scalar-loop form of _trajectory_kernel_numpy for compilation with numba"""
+    steps = lats.shape[0] - 1
+    speeds = np.zeros(steps)
+    total_km = 0.0
+    
+    lat1_rad = math.radians(lats[0])
+    cos_lat1 = math.cos(lat1_rad)
+    for i in range(steps):
+        lat2_rad = math.radians(lats[i + 1])
+        cos_lat2 = math.cos(lat2_rad)
+        dlat = lat2_rad - lat1_rad
+        dlon = math.radians(lons[i + 1] - lons[i])
+        
+        a = math.sin(dlat / 2) ** 2 + cos_lat1 * cos_lat2 * math.sin(dlon / 2) ** 2
+        distance = 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
+        lat1_rad = lat2_rad
+        cos_lat1 = cos_lat2
+        if math.isnan(distance):
+            continue
+        
+        total_km += distance
+        time_diff_hours = (times_s[i + 1] - times_s[i]) / 3600
+        if time_diff_hours > 0:
+            speeds[i] = distance / time_diff_hours
+    
+    return total_km, speeds
+
+
+# fastmath is left off because missing points are carried as NaN
+_trajectory_kernel = njit(cache=True)(_trajectory_kernel_loop) if njit else _trajectory_kernel_numpy
+
+
+@dataclass(slots=True)
+class Anomaly:
+    """A single unusual movement step in a location history"""
+    type: str  # "high_speed" or "impossible_speed"
+    speed_kmh: float
+    timestamp: Optional[str]  # timestamp of the location the step ends at
+    description: str
+
+
+# Quadrant bitmask ((x >= 0) << 1) | (y >= 0) -> counter-clockwise quadrant index
+_QUADRANT_ORDER = np.array([2, 1, 3, 0], dtype=np.uint8)
+# Quarter turns contributed by an edge moving d quadrants counter-clockwise (d == 2 uses the determinant)
+_QUADRANT_TURNS = np.array([0, 1, 0, -1], dtype=np.int64)
+
+
+def _winding_number(lat: float, lon: float, poly_lats: np.ndarray, poly_lons: np.ndarray) -> Tuple[int, bool]:
+    """Winding number of a polygon around a point, and whether the point lies on an edge"""
+    # Edge endpoints relative to the point, x = longitude and y = latitude
+    tx = poly_lons - lon
+    ty = poly_lats - lat
+    nx = np.roll(tx, -1)
+    ny = np.roll(ty, -1)
+    
+    q_this = _QUADRANT_ORDER[((tx >= 0).astype(np.uint8) << 1) | (ty >= 0)]
+    q_next = _QUADRANT_ORDER[((nx >= 0).astype(np.uint8) << 1) | (ny >= 0)]
+    d = (q_next - q_this) & 3
+    
+    det = tx * ny - ty * nx
+    # Collinear with an edge and between its endpoints
+    on_edge = bool(np.any((det == 0) & (tx * nx + ty * ny <= 0)))
+    
+    quarter_turns = _QUADRANT_TURNS[d] + (d == 2) * 2 * np.sign(det).astype(np.int64)
+    return int(quarter_turns.sum()) // 4, on_edge
+
+
+@dataclass
+class LocationTrack:
+    """Time-ordered location history stored as parallel columns"""
+    lat: np.ndarray  # degrees, NaN where missing
+    lon: np.ndarray  # degrees, NaN where missing
+    ts: np.ndarray  # epoch seconds, NaN where missing
+    timestamps: List[Optional[str]]  # original timestamp strings, in track order
+    
+    def __len__(self) -> int:
+        return self.lat.shape[0]
+
+
 class DeviceLocationAgent(BaseAgent):
+    # Lower bound of each risk level above MINIMAL
+    _RISK_CUTOFFS = (0.2, 0.5, 0.8)
+    _RISK_NAMES = ("MINIMAL", "LOW", "MEDIUM", "HIGH")
+    
     def __init__(self):
         super().__init__(
             agent_id="device_location_agent",
             name="Device Location Analysis Agent", 
             description="Specialized agent for device location tracking and geospatial analysis using CAMARA Device Location API",
-            capabilities=["location_verification", "movement_analysis", "geofencing", "location_risk_assessment"]
+            capabilities=["location_verification", "movement_analysis", "geofencing", "location_risk_assessment",
+                          "batch_location_verification"]
         )
         
         self.camara_base_url = "http://localhost:8001/camara"
+        self._client: Optional[httpx.AsyncClient] = None
+        self._redis = None
+        self._radians_cache: Dict[Tuple[float, float], Tuple[float, float, float]] = {}
         
     async def _initialize_agent(self) -> None:
         self.logger.info("Initializing Device Location Agent")
+        self._get_client()
+        
+        redis_url = os.getenv("REDIS_URL")
+        if aioredis is not None and redis_url:
+            self._redis = aioredis.Redis.from_url(redis_url)
         
     async def _cleanup_agent(self) -> None:
         self.logger.info("Cleaning up Device Location Agent")
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+        if self._redis is not None:
+            await self._redis.aclose()
+            self._redis = None
+            
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the pooled CAMARA client, creating it if needed"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.camara_base_url,
+                http2=True,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                timeout=httpx.Timeout(10.0, connect=5.0)
+            )
+        return self._client
+        
+    async def _cached_fetch(self, key: str, ttl: int, fetch) -> Dict[str, Any]:
+        """Return the cached response for key, calling fetch and caching its result on a miss"""
+        if self._redis is None:
+            return await fetch()
+            
+        try:
+            cached = await self._redis.get(key)
+            if cached is not None:
+                return orjson.loads(cached)
+        except Exception as e:
+            self.logger.warning(f"Redis cache read failed for {key}: {e}")
+            
+        data = await fetch()
+        
+        try:
+            await self._redis.set(key, orjson.dumps(data), ex=ttl)
+        except Exception as e:
+            self.logger.warning(f"Redis cache write failed for {key}: {e}")
+        return data
+        
+    async def _retrieve_location(self, phone_number: str, area: Optional[Dict[str, Any]] = None,
+                                 accuracy: Optional[int] = None) -> Dict[str, Any]:
+        """Fetch the current device location from CAMARA, cached per phone number, area and accuracy"""
+        async def fetch() -> Dict[str, Any]:
+            payload = {"device": {"phoneNumber": phone_number}, "area": area}
+            if accuracy is not None:
+                payload["accuracy"] = accuracy
+            response = await self._get_client().post("/device-location/v1/retrieve", json=payload)
+            response.raise_for_status()
+            return orjson.loads(response.content)
+            
+        # The requested area and accuracy shape the response, so they are part of the key
+        area_key = hashlib.blake2b(orjson.dumps(area, option=orjson.OPT_SORT_KEYS), digest_size=8).hexdigest()
+        return await self._cached_fetch(f"camara:loc:{phone_number}:{accuracy}:{area_key}", LOCATION_CACHE_TTL, fetch)
+        
+    async def _retrieve_history(self, phone_number: str, hours: int) -> Dict[str, Any]:
+        """Fetch the device location history from CAMARA, cached per phone number and window"""
+        async def fetch() -> Dict[str, Any]:
+            response = await self._get_client().get(
+                f"/device-location/v1/history/{phone_number}",
+                params={"hours": hours}
+            )
+            response.raise_for_status()
+            return orjson.loads(response.content)
+            
+        return await self._cached_fetch(f"camara:hist:{phone_number}:{hours}", HISTORY_CACHE_TTL, fetch)
+        
+    async def _retrieve_snapshot(self, phone_number: str, hours: int) -> Dict[str, Any]:
+        """Fetch the current location and location history from CAMARA in one call"""
+        response = await self._get_client().post(
+            "/device-location/v1/snapshot",
+            json={
+                "phoneNumber": phone_number,
+                "include": ["current", "history"],
+                "hours": hours
+            }
+        )
+        response.raise_for_status()
+        return orjson.loads(response.content)
         
     async def execute_capability(self, capability_type: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
         if capability_type == "location_verification":
@@ -33,6 +260,16 @@ class DeviceLocationAgent(BaseAgent):
             return await self._check_geofence(input_data)
         elif capability_type == "location_risk_assessment":
             return await self._assess_location_risk(input_data)
+        elif capability_type == "batch_location_verification":
+            await self.validate_input(input_data, ["phone_numbers"])
+            return {
+                "results": await self.verify_locations_batch(
+                    input_data["phone_numbers"],
+                    expected_area=input_data.get("expected_area"),
+                    accuracy=input_data.get("accuracy", 1000)
+                ),
+                "confidence": 0.88
+            }
         else:
             raise ValueError(f"Unsupported capability: {capability_type}")
             
@@ -42,36 +279,23 @@ class DeviceLocationAgent(BaseAgent):
         phone_number = input_data["phone_number"]
         expected_area = input_data.get("expected_area")
         accuracy = input_data.get("accuracy", 1000)  # meters
+        skip_match = input_data.get("skip_match", False)  # only the current location is needed
         
         self.logger.info(f"Verifying location for {phone_number}")
         
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.camara_base_url}/device-location/v1/retrieve",
-                    json={
-                        "device": {"phoneNumber": phone_number},
-                        "area": expected_area,
-                        "accuracy": accuracy
-                    }
-                )
-                response.raise_for_status()
-                location_data = response.json()
+            location_data = await self._retrieve_location(phone_number, expected_area, accuracy)
+            
+            if skip_match and expected_area is None:
+                return {
+                    "phone_number": phone_number,
+                    "current_location": location_data.get("area", {}),
+                    "accuracy_radius_meters": location_data.get("accuracy", accuracy),
+                    "timestamp": location_data.get("timestamp", datetime.utcnow().isoformat()),
+                    "confidence": 0.88
+                }
                 
-            verification_result = self._analyze_location_verification(location_data, expected_area)
-            
-            return {
-                "phone_number": phone_number,
-                "current_location": location_data.get("area", {}),
-                "location_match": verification_result["match_status"],
-                "match_confidence": verification_result["confidence"],
-                "distance_from_expected": verification_result.get("distance_km"),
-                "accuracy_radius_meters": location_data.get("accuracy", accuracy),
-                "timestamp": location_data.get("timestamp", datetime.utcnow().isoformat()),
-                "analysis": verification_result["analysis"],
-                "confidence": 0.88,
-                "recommendations": verification_result["recommendations"]
-            }
+            return self._build_verification_result(phone_number, location_data, expected_area, accuracy)
             
         except Exception as e:
             self.logger.error(f"Location verification failed: {e}")
@@ -81,6 +305,73 @@ class DeviceLocationAgent(BaseAgent):
                 "confidence": 0.0
             }
             
+    async def verify_locations_batch(self, phone_numbers: List[str],
+                                     expected_area: Optional[Dict[str, Any]] = None,
+                                     accuracy: int = 1000) -> Dict[str, Dict[str, Any]]:
+        """Verify locations for many devices with a single CAMARA batch call"""
+        self.logger.info(f"Verifying locations for {len(phone_numbers)} devices")
+        
+        try:
+            response = await self._get_client().post(
+                "/device-location/v1/batch-retrieve",
+                json={
+                    "devices": [{"phoneNumber": phone_number} for phone_number in phone_numbers],
+                    "requested_accuracy": accuracy
+                }
+            )
+            response.raise_for_status()
+            batch_data = orjson.loads(response.content)
+            
+            # Match locations to devices by the device they report, not by position
+            locations = {
+                location_data.get("device"): location_data
+                for location_data in batch_data.get("locations", [])
+            }
+            results = {}
+            for phone_number in phone_numbers:
+                location_data = locations.get(phone_number)
+                if location_data is None:
+                    results[phone_number] = {
+                        "phone_number": phone_number,
+                        "error": "Location verification failed: no location returned for device",
+                        "confidence": 0.0
+                    }
+                else:
+                    results[phone_number] = self._build_verification_result(
+                        phone_number, location_data, expected_area, accuracy
+                    )
+            return results
+            
+        except Exception as e:
+            # Fall back to concurrent per-device lookups on the pooled client
+            self.logger.warning(f"Batch location retrieval failed, falling back to per-device calls: {e}")
+            results = await asyncio.gather(*(
+                self._verify_location({
+                    "phone_number": phone_number,
+                    "expected_area": expected_area,
+                    "accuracy": accuracy
+                })
+                for phone_number in phone_numbers
+            ))
+            return dict(zip(phone_numbers, results))
+            
+    def _build_verification_result(self, phone_number: str, location_data: Dict[str, Any],
+                                   expected_area: Optional[Dict[str, Any]], accuracy: int) -> Dict[str, Any]:
+        verification_result = self._analyze_location_verification(location_data, expected_area)
+        
+        return {
+            "phone_number": phone_number,
+            "current_location": location_data.get("area", {}),
+            "location_match": verification_result["match_status"],
+            "match_confidence": verification_result["confidence"],
+            "distance_from_expected": verification_result.get("distance_km"),
+            "accuracy_radius_meters": location_data.get("accuracy", accuracy),
+            "timestamp": location_data.get("timestamp", datetime.utcnow().isoformat()),
+            "analysis": verification_result["analysis"],
+            "confidence": 0.88,
+            "recommendations": verification_result["recommendations"]
+        }
+            
     async def _analyze_movement(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         await self.validate_input(input_data, ["phone_number"])
         
@@ -89,26 +380,9 @@ class DeviceLocationAgent(BaseAgent):
         
         try:
             # Get location history
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.camara_base_url}/device-location/v1/history/{phone_number}",
-                    params={"hours": time_window_hours}
-                )
-                response.raise_for_status()
-                history_data = response.json()
-                
-            movement_analysis = self._analyze_movement_patterns(history_data)
+            history_data = await self._retrieve_history(phone_number, time_window_hours)
             
-            return {
-                "phone_number": phone_number,
-                "time_window_hours": time_window_hours,
-                "location_history": history_data.get("locations", []),
-                "movement_patterns": movement_analysis,
-                "total_distance_km": movement_analysis.get("total_distance", 0),
-                "max_speed_kmh": movement_analysis.get("max_speed", 0),
-                "unusual_movements": movement_analysis.get("anomalies", []),
-                "confidence": 0.85
-            }
+            return self._build_movement_result(phone_number, time_window_hours, history_data)
             
         except Exception as e:
             self.logger.error(f"Movement analysis failed: {e}")
@@ -118,6 +392,22 @@ class DeviceLocationAgent(BaseAgent):
                 "confidence": 0.0
             }
             
+    def _build_movement_result(self, phone_number: str, time_window_hours: int,
+                               history_data: Dict[str, Any]) -> Dict[str, Any]:
+        movement_analysis = self._analyze_movement_patterns(history_data)
+        movement_analysis["anomalies"] = [asdict(anomaly) for anomaly in movement_analysis["anomalies"]]
+        
+        return {
+            "phone_number": phone_number,
+            "time_window_hours": time_window_hours,
+            "location_history": history_data.get("locations", []),
+            "movement_patterns": movement_analysis,
+            "total_distance_km": movement_analysis.get("total_distance", 0),
+            "max_speed_kmh": movement_analysis.get("max_speed", 0),
+            "unusual_movements": movement_analysis.get("anomalies", []),
+            "confidence": 0.85
+        }
+        
     async def _check_geofence(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         await self.validate_input(input_data, ["phone_number", "geofence_area"])
         
@@ -126,17 +416,8 @@ class DeviceLocationAgent(BaseAgent):
         
         try:
             # Get current location
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.camara_base_url}/device-location/v1/retrieve",
-                    json={
-                        "device": {"phoneNumber": phone_number},
-                        "area": geofence
-                    }
-                )
-                response.raise_for_status()
-                location_data = response.json()
-                
+            location_data = await self._retrieve_location(phone_number, geofence)
+            
             # Check if device is within geofence
             within_geofence = self._check_within_area(location_data.get("area", {}), geofence)
             
@@ -168,19 +449,32 @@ class DeviceLocationAgent(BaseAgent):
         risk_score = 0.0
         
         try:
-            # Get current location
-            location_result = await self._verify_location({"phone_number": phone_number})
-            
-            if "error" in location_result:
-                return location_result
+            try:
+                # Get current location and movement history in one round-trip
+                snapshot = await self._retrieve_snapshot(phone_number, 48)
+                current_location = snapshot.get("current", {}).get("area", {})
+                movement_result = self._build_movement_result(phone_number, 48, snapshot.get("history", {}))
                 
-            current_location = location_result.get("current_location", {})
-            
-            # Get movement history for risk analysis
-            movement_result = await self._analyze_movement({
-                "phone_number": phone_number,
-                "time_window_hours": 48
-            })
+            except Exception as e:
+                # Fall back to concurrent per-endpoint calls
+                self.logger.warning(f"Location snapshot failed, falling back to separate calls: {e}")
+                location_result, movement_result = await asyncio.gather(
+                    self._verify_location({"phone_number": phone_number, "skip_match": True}),
+                    self._analyze_movement({
+                        "phone_number": phone_number,
+                        "time_window_hours": 48
+                    }),
+                    return_exceptions=True
+                )
+                
+                if isinstance(location_result, Exception):
+                    raise location_result
+                if "error" in location_result:
+                    return location_result
+                if isinstance(movement_result, Exception):
+                    movement_result = {"error": str(movement_result)}
+                    
+                current_location = location_result.get("current_location", {})
             
             # Analyze location-based risks
             location_risks = self._analyze_location_risks(current_location, context)
@@ -264,10 +558,29 @@ class DeviceLocationAgent(BaseAgent):
             "recommendations": recommendations
         }
         
-    def _analyze_movement_patterns(self, history_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _to_track(self, history_data: Dict[str, Any]) -> LocationTrack:
+        """Convert a CAMARA location history into a time-ordered LocationTrack"""
         locations = history_data.get("locations", [])
         
-        if len(locations) < 2:
+        # Missing coordinates/timestamps become NaN and drop out of movement sums
+        timestamps = [loc.get("timestamp") for loc in locations]
+        lats = np.array([loc.get("area", {}).get("latitude") for loc in locations], dtype=np.float64)
+        lons = np.array([loc.get("area", {}).get("longitude") for loc in locations], dtype=np.float64)
+        times_s = self._parse_epoch_seconds(timestamps)
+        
+        # Sort locations by timestamp
+        order = np.argsort(times_s, kind="stable")
+        return LocationTrack(
+            lat=lats[order],
+            lon=lons[order],
+            ts=times_s[order],
+            timestamps=[timestamps[i] for i in order]
+        )
+        
+    def _analyze_movement_patterns(self, history_data: Dict[str, Any]) -> Dict[str, Any]:
+        track = self._to_track(history_data)
+        
+        if len(track) < 2:
             return {
                 "total_distance": 0,
                 "max_speed": 0,
@@ -275,56 +588,24 @@ class DeviceLocationAgent(BaseAgent):
                 "movement_type": "stationary"
             }
             
-        total_distance = 0
-        max_speed = 0
-        anomalies = []
-        
-        # Sort locations by timestamp
-        sorted_locations = sorted(locations, key=lambda x: x.get("timestamp", ""))
-        
-        for i in range(1, len(sorted_locations)):
-            prev_loc = sorted_locations[i-1]
-            curr_loc = sorted_locations[i]
-            
-            # Calculate distance and speed
-            distance = self._calculate_distance(prev_loc.get("area", {}), curr_loc.get("area", {}))
-            
-            if distance is not None:
-                total_distance += distance
-                
-                # Calculate speed if timestamps available
-                prev_time = prev_loc.get("timestamp")
-                curr_time = curr_loc.get("timestamp")
-                
-                if prev_time and curr_time:
-                    try:
-                        time_diff_hours = (
-                            datetime.fromisoformat(curr_time.replace('Z', '+00:00')) - 
-                            datetime.fromisoformat(prev_time.replace('Z', '+00:00'))
-                        ).total_seconds() / 3600
-                        
-                        if time_diff_hours > 0:
-                            speed_kmh = distance / time_diff_hours
-                            max_speed = max(max_speed, speed_kmh)
-                            
-                            # Detect anomalous speeds
-                            if speed_kmh > 500:  # Faster than commercial aircraft
-                                anomalies.append({
-                                    "type": "impossible_speed",
-                                    "speed_kmh": round(speed_kmh, 1),
-                                    "timestamp": curr_time,
-                                    "description": f"Impossibly high speed: {speed_kmh:.1f} km/h"
-                                })
-                            elif speed_kmh > 200:  # Faster than highway speeds
-                                anomalies.append({
-                                    "type": "high_speed",
-                                    "speed_kmh": round(speed_kmh, 1),
-                                    "timestamp": curr_time,
-                                    "description": f"Unusually high speed: {speed_kmh:.1f} km/h"
-                                })
-                                
-                    except Exception:
-                        pass
+        # Distance and speed for every consecutive pair of locations
+        total_distance, speeds = _trajectory_kernel(track.lat, track.lon, track.ts)
+        total_distance = float(total_distance)
+        max_speed = float(speeds.max())
+        
+        # Detect anomalous speeds: > 200 km/h is faster than highway speeds,
+        # > 500 km/h is faster than commercial aircraft
+        anomaly_idx = np.nonzero(speeds > 200)[0]
+        impossible = speeds[anomaly_idx] > 500
+        anomalies = [
+            Anomaly(
+                type=SPEED_ANOMALY_TYPES[kind][0],
+                speed_kmh=round(speed_kmh, 1),
+                timestamp=track.timestamps[i + 1],
+                description=f"{SPEED_ANOMALY_TYPES[kind][1]}: {speed_kmh:.1f} km/h"
+            )
+            for i, kind, speed_kmh in zip(anomaly_idx.tolist(), impossible.tolist(), speeds[anomaly_idx].tolist())
+        ]
                         
         # Determine movement type
         if total_distance < 1:
@@ -341,9 +622,35 @@ class DeviceLocationAgent(BaseAgent):
             "max_speed": round(max_speed, 1),
             "anomalies": anomalies,
             "movement_type": movement_type,
-            "location_count": len(locations)
+            "location_count": len(track)
         }
         
+    @staticmethod
+    def _parse_epoch_seconds(timestamps: List[Optional[str]]) -> np.ndarray:
+        """Parse ISO timestamps to epoch seconds in one pass, NaN where missing or invalid"""
+        cleaned = [ts.rstrip("Z") if ts else "NaT" for ts in timestamps]
+        
+        try:
+            with warnings.catch_warnings():
+                # Explicit UTC offsets are converted to UTC; numpy warns that it drops the tz
+                warnings.simplefilter("ignore", UserWarning)
+                parsed = np.array(cleaned, dtype="datetime64[ns]")
+        except ValueError:
+            return np.array([DeviceLocationAgent._parse_epoch_second(ts) for ts in timestamps], dtype=np.float64)
+        
+        seconds = parsed.astype(np.int64) / 1e9
+        seconds[np.isnat(parsed)] = np.nan
+        return seconds
+        
+    @staticmethod
+    def _parse_epoch_second(timestamp: Optional[str]) -> float:
+        if not timestamp:
+            return math.nan
+        try:
+            return datetime.fromisoformat(timestamp.replace('Z', '+00:00')).timestamp()
+        except Exception:
+            return math.nan
+        
     def _check_within_area(self, current_location: Dict[str, Any], 
                           geofence: Dict[str, Any]) -> Dict[str, Any]:
         # Simplified geofence checking
@@ -352,7 +659,7 @@ class DeviceLocationAgent(BaseAgent):
         current_lat = current_location.get("latitude")
         current_lon = current_location.get("longitude")
         
-        if not all([current_lat, current_lon]):
+        if current_lat is None or current_lon is None:
             return {"inside": False, "confidence": 0.0}
             
         # Check if geofence is circular (has radius)
@@ -361,13 +668,19 @@ class DeviceLocationAgent(BaseAgent):
             center_lon = geofence.get("longitude")
             radius_meters = geofence.get("radius", 1000)
             
-            if not all([center_lat, center_lon]):
+            if center_lat is None or center_lon is None:
                 return {"inside": False, "confidence": 0.0}
                 
-            distance_meters = self._calculate_distance_meters(
-                (current_lat, current_lon),
-                (center_lat, center_lon)
-            )
+            if radius_meters < EQUIRECTANGULAR_MAX_RADIUS_M:
+                distance_meters = self._equirectangular_distance_meters(
+                    (current_lat, current_lon),
+                    (center_lat, center_lon)
+                )
+            else:
+                distance_meters = self._calculate_distance_meters(
+                    (current_lat, current_lon),
+                    (center_lat, center_lon)
+                )
             
             inside = distance_meters <= radius_meters
             distance_to_boundary = abs(distance_meters - radius_meters)
@@ -378,41 +691,90 @@ class DeviceLocationAgent(BaseAgent):
                 "distance_to_boundary": distance_to_boundary
             }
             
+        # Polygonal geofence given as a list of boundary points
+        if "boundary" in geofence:
+            boundary = geofence["boundary"]
+            if len(boundary) < 3:
+                return {"inside": False, "confidence": 0.0}
+                
+            # Cheap bounding-box rejection before the per-edge winding test
+            min_lat, max_lat, min_lon, max_lon = self._polygon_bbox(boundary)
+            if not (min_lat <= current_lat <= max_lat and min_lon <= current_lon <= max_lon):
+                return {"inside": False, "confidence": 0.9}
+                
+            return {
+                "inside": self._point_in_polygon(current_lat, current_lon, boundary),
+                "confidence": 0.9
+            }
+            
         # For other geofence types, return basic check
         return {"inside": True, "confidence": 0.5}
         
+    @staticmethod
+    def _polygon_bbox(polygon_coords: List[Dict[str, float]]) -> Tuple[float, float, float, float]:
+        """Bounding box of a polygon as (min_lat, max_lat, min_lon, max_lon)"""
+        lats = [point["latitude"] for point in polygon_coords]
+        lons = [point["longitude"] for point in polygon_coords]
+        return min(lats), max(lats), min(lons), max(lons)
+        
+    def _point_in_polygon(self, lat: float, lon: float, polygon_coords: List[Dict[str, float]]) -> bool:
+        """Winding-number point-in-polygon test; points on the boundary count as inside"""
+        if len(polygon_coords) < 3:
+            return False
+            
+        poly_lats = np.array([point["latitude"] for point in polygon_coords], dtype=np.float64)
+        poly_lons = np.array([point["longitude"] for point in polygon_coords], dtype=np.float64)
+        winding, on_edge = _winding_number(lat, lon, poly_lats, poly_lons)
+        return on_edge or winding != 0
+        
     def _calculate_distance(self, loc1: Dict[str, Any], loc2: Dict[str, Any]) -> Optional[float]:
         lat1 = loc1.get("latitude")
         lon1 = loc1.get("longitude")
         lat2 = loc2.get("latitude")
         lon2 = loc2.get("longitude")
         
-        if not all([lat1, lon1, lat2, lon2]):
+        if lat1 is None or lon1 is None or lat2 is None or lon2 is None:
             return None
             
-        return self._haversine_distance(lat1, lon1, lat2, lon2)
-        
-    def _haversine_distance(self, lat1: float, lon1: float, lat2: float, lon2: float) -> float:
-        R = 6371  # Earth radius in kilometers
-        
-        lat1_rad = math.radians(lat1)
-        lon1_rad = math.radians(lon1)
+        # loc2 is the reference point (expected area), so its trig terms are cached
+        return self._haversine_distance_cached(*self._reference_radians(lat2, lon2), lat1, lon1)
+        
+    def _reference_radians(self, lat: float, lon: float) -> Tuple[float, float, float]:
+        """(lat_rad, cos_lat, lon_rad) of a reference point, cached across calls"""
+        key = (lat, lon)
+        cached = self._radians_cache.get(key)
+        if cached is None:
+            if len(self._radians_cache) >= RADIANS_CACHE_SIZE:
+                self._radians_cache.clear()
+            lat_rad = math.radians(lat)
+            cached = self._radians_cache[key] = (lat_rad, math.cos(lat_rad), math.radians(lon))
+        return cached
+        
+    def _haversine_distance_cached(self, lat1_rad: float, cos_lat1: float, lon1_rad: float,
+                                   lat2: float, lon2: float) -> float:
+        """Haversine distance in km from a point with precomputed radians to (lat2, lon2)"""
         lat2_rad = math.radians(lat2)
-        lon2_rad = math.radians(lon2)
-        
         dlat = lat2_rad - lat1_rad
-        dlon = lon2_rad - lon1_rad
-        
-        a = math.sin(dlat/2)**2 + math.cos(lat1_rad) * math.cos(lat2_rad) * math.sin(dlon/2)**2
-        c = 2 * math.asin(math.sqrt(a))
+        dlon = math.radians(lon2) - lon1_rad
         
-        return R * c
+        a = math.sin(dlat / 2) ** 2 + cos_lat1 * math.cos(lat2_rad) * math.sin(dlon / 2) ** 2
+        return 2 * EARTH_RADIUS_KM * math.asin(math.sqrt(a))
         
     def _calculate_distance_meters(self, point1: Tuple[float, float], 
                                   point2: Tuple[float, float]) -> float:
         lat1, lon1 = point1
         lat2, lon2 = point2
-        return self._haversine_distance(lat1, lon1, lat2, lon2) * 1000
+        # point2 is the geofence centre, so its trig terms are cached
+        return self._haversine_distance_cached(*self._reference_radians(lat2, lon2), lat1, lon1) * 1000
+        
+    def _equirectangular_distance_meters(self, point1: Tuple[float, float],
+                                         point2: Tuple[float, float]) -> float:
+        """Equirectangular distance approximation, accurate at geofence scales"""
+        lat1, lon1 = point1
+        lat2, lon2 = point2
+        x = math.radians(lon1 - lon2) * math.cos(math.radians((lat1 + lat2) / 2)) * EARTH_RADIUS_KM
+        y = math.radians(lat1 - lat2) * EARTH_RADIUS_KM
+        return math.hypot(x, y) * 1000
         
     def _analyze_location_risks(self, location: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
         risk_factors = []
@@ -487,14 +849,7 @@ class DeviceLocationAgent(BaseAgent):
         }
         
     def _categorize_risk(self, risk_score: float) -> str:
-        if risk_score >= 0.8:
-            return "HIGH"
-        elif risk_score >= 0.5:
-            return "MEDIUM"
-        elif risk_score >= 0.2:
-            return "LOW"
-        else:
-            return "MINIMAL"
+        return self._RISK_NAMES[bisect_right(self._RISK_CUTOFFS, risk_score)]
             
     def _generate_verification_recommendations(self, match_status: str, distance_km: Optional[float]) -> List[str]:
         if match_status == "exact_match":
@@ -536,9 +891,8 @@ class DeviceLocationAgent(BaseAgent):
         
     async def _get_agent_health(self) -> Dict[str, Any]:
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.camara_base_url}/health")
-                camara_status = response.status_code == 200
+            response = await self._get_client().get("/health")
+            camara_status = response.status_code == 200
         except Exception:
             camara_status = False
             
@@ -548,6 +902,7 @@ class DeviceLocationAgent(BaseAgent):
                 "location_verification",
                 "movement_analysis",
                 "geofencing",
-                "location_risk_assessment"
+                "location_risk_assessment",
+                "batch_location_verification"
             ]
         }
\ No newline at end of file
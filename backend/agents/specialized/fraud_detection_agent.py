@@ -1,13 +1,188 @@
 import asyncio
-from typing import Dict, List, Any, Optional
+import copy
+import heapq
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
 from datetime import datetime, timedelta
 import httpx
+import orjson
 import random
 import json
+import time
+import zlib
+import numpy as np
 
 from ..base.base_agent import BaseAgent
 
 
+# Seconds a successful CAMARA response stays valid per API type; other types are not cached
+CAMARA_CACHE_TTL = {
+    "device_swap": 600,
+    "sim_swap": 600,
+    "location": 60,
+    "scam_signal": 300
+}
+CAMARA_CACHE_MAX_ENTRIES = 10_000
+
+# Request payloads of the fraud CAMARA checks, without the phone number field
+CAMARA_PAYLOAD_TEMPLATES = {
+    "device_swap": {"max_age": 240},
+    "sim_swap": {"max_age": 240},
+    "location": {"max_age": 60},
+    "scam_signal": {
+        "analysis_period_hours": 24,
+        "include_call_patterns": True,
+        "include_message_patterns": True
+    }
+}
+# Payload field carrying the phone number, per check
+CAMARA_PHONE_KEYS = {
+    "device_swap": "phone_number",
+    "sim_swap": "phone_number",
+    "location": "device",
+    "scam_signal": "phone_number"
+}
+
+# Bound on the whole CAMARA fan-out (seconds) and on outbound CAMARA calls in flight
+CAMARA_CHECKS_TIMEOUT = 3.0
+CAMARA_MAX_CONCURRENCY = 50
+
+# Attempts per CAMARA call and the first retry delay (seconds); retries stay inside CAMARA_CHECKS_TIMEOUT
+CAMARA_MAX_ATTEMPTS = 3
+CAMARA_RETRY_BASE_DELAY = 0.05
+
+# Preliminary (pre-CAMARA) risk scores above this already decide the request, so CAMARA checks are skipped;
+# low scores are never skipped, since SIM and device swaps are invisible to the local checks
+CAMARA_SKIP_ABOVE_SCORE = 0.85
+
+# Risk contribution of a fraud indicator per unit of confidence, by severity
+SEVERITY_WEIGHTS = {
+    "low": 0.1,
+    "medium": 0.3,
+    "high": 0.5,
+    "critical": 0.8
+}
+# Array form of SEVERITY_WEIGHTS for batch scoring; unknown severities map to "low"
+SEVERITY_INDEX = {severity: i for i, severity in enumerate(SEVERITY_WEIGHTS)}
+SEVERITY_WEIGHT_ARRAY = np.array(list(SEVERITY_WEIGHTS.values()))
+
+
+# Shared generator for the mock model draws
+_RNG = np.random.default_rng()
+
+# Mock risk components and the upper bound of each one's contribution
+RISK_COMPONENT_KEYS = ("account_age", "transaction_history", "device_trust", "location_consistency", "behavioral_patterns")
+RISK_COMPONENT_SCALES = np.array([0.2, 0.3, 0.4, 0.2, 0.3])
+
+# [monotonic_ns of last refresh, ISO timestamp]; refreshed at most once per millisecond
+_TS_CACHE = [0, ""]
+
+
+def _indicator_weight(indicator: Dict[str, Any]) -> float:
+    """Risk contribution of a single fraud indicator"""
+    return SEVERITY_WEIGHTS.get(indicator.get("severity", "low"), 0.1) * indicator.get("confidence", 0.5)
+
+
+def _now_iso() -> str:
+    """Current UTC time as an ISO string, cached at millisecond granularity"""
+    now_ns = time.monotonic_ns()
+    if now_ns - _TS_CACHE[0] > 1_000_000 or not _TS_CACHE[1]:
+        _TS_CACHE[0] = now_ns
+        _TS_CACHE[1] = datetime.utcnow().isoformat()
+    return _TS_CACHE[1]
+
+
+class FraudBatcher:
+    """
+    Collects concurrent requests into batches for a batch handler
+    A batch is dispatched when it reaches max_batch_size or its oldest request
+    has waited max_queue_time seconds; with process_one set, a request that
+    arrives while the batcher is idle is handled on its own without waiting
+    """
+    
+    def __init__(self, process_batch: Callable[[List[Any]], Awaitable[List[Any]]],
+                 max_batch_size: int = 32, max_queue_time: float = 0.02,
+                 process_one: Optional[Callable[[Any], Awaitable[Any]]] = None):
+        self.process_batch = process_batch
+        self.process_one = process_one
+        self.max_batch_size = max_batch_size
+        self.max_queue_time = max_queue_time
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._runner: Optional[asyncio.Task] = None
+        self._dispatches: Set[asyncio.Task] = set()
+        self._collecting = False
+        self._direct = 0
+    
+    def _idle(self) -> bool:
+        """Whether no request is queued, being batched or being processed"""
+        return not (self._direct or self._collecting or self._dispatches or not self._queue.empty())
+    
+    async def process(self, item: Any) -> Any:
+        """Submit one request and wait for its result"""
+        # A lone request skips the batching window; concurrent ones are batched
+        if self.process_one is not None and self._idle():
+            self._direct += 1
+            try:
+                return await self.process_one(item)
+            finally:
+                self._direct -= 1
+        
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self.run())
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((item, future))
+        return await future
+    
+    async def run(self) -> None:
+        """Accumulate queued requests into batches and dispatch them"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            self._collecting = True
+            deadline = loop.time() + self.max_queue_time
+            
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+            
+            # Dispatch without waiting so the next batch can start filling
+            task = asyncio.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+            self._collecting = False
+    
+    async def _dispatch(self, batch: List[Tuple[Any, asyncio.Future]]) -> None:
+        """Run the batch handler and resolve each request's future"""
+        try:
+            results = await self.process_batch([item for item, _ in batch])
+        except Exception as e:
+            results = [e] * len(batch)
+        
+        for (_, future), result in zip(batch, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+    
+    async def close(self) -> None:
+        """Stop the batching loop; requests already dispatched still complete"""
+        if self._runner is not None:
+            self._runner.cancel()
+            await asyncio.gather(self._runner, return_exceptions=True)
+            self._runner = None
+            self._collecting = False
+        if self._dispatches:
+            await asyncio.gather(*self._dispatches, return_exceptions=True)
+
+
 class FraudDetectionAgent(BaseAgent):
     """
     Specialized agent for fraud detection using CAMARA APIs
@@ -35,15 +210,30 @@ class FraudDetectionAgent(BaseAgent):
             "critical": 0.9
         }
         
-        # CAMARA API endpoints
+        # CAMARA API endpoints, parsed once so calls skip URL parsing
         self.camara_endpoints = {
-            "device_swap": "http://localhost:8000/camara/device-swap/v1/check",
-            "sim_swap": "http://localhost:8000/camara/sim-swap/v1/check",
-            "location": "http://localhost:8000/camara/location/v1/retrieve",
-            "kyc_match": "http://localhost:8000/camara/kyc-match/v1/verify",
-            "scam_signal": "http://localhost:8000/camara/scam-signal/v1/analyze"
+            api_type: httpx.URL(url)
+            for api_type, url in {
+                "device_swap": "http://localhost:8000/camara/device-swap/v1/check",
+                "sim_swap": "http://localhost:8000/camara/sim-swap/v1/check",
+                "location": "http://localhost:8000/camara/location/v1/retrieve",
+                "kyc_match": "http://localhost:8000/camara/kyc-match/v1/verify",
+                "scam_signal": "http://localhost:8000/camara/scam-signal/v1/analyze"
+            }.items()
         }
         
+        # Pooled CAMARA client shared by all checks
+        self._client: Optional[httpx.AsyncClient] = None
+        self._camara_sem = asyncio.Semaphore(CAMARA_MAX_CONCURRENCY)
+        
+        # (api_type, phone_number) -> (fetched_at, response), oldest first
+        self._camara_cache: OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]] = OrderedDict()
+        # (api_type, phone_number) -> upstream call currently in flight
+        self._camara_inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        
+        # Concurrent fraud_detection requests are processed in batches
+        self._batcher = FraudBatcher(self._detect_fraud_batch, process_one=self._detect_fraud)
+        
         # Fraud patterns database
         self.fraud_patterns = {
             "sim_swap_fraud": {
@@ -63,6 +253,11 @@ class FraudDetectionAgent(BaseAgent):
                 "indicators": ["unusual_amount", "new_payee", "time_anomaly"]
             }
         }
+        
+        # Column-wise view of fraud_patterns for vectorised sweeps
+        self._pattern_names = list(self.fraud_patterns.keys())
+        self._pattern_weights = np.array([p["weight"] for p in self.fraud_patterns.values()], dtype=np.float64)
+        self._pattern_indicators = [p["indicators"] for p in self.fraud_patterns.values()]
     
     async def _initialize_agent(self) -> None:
         """Initialize fraud detection models and data"""
@@ -77,18 +272,41 @@ class FraudDetectionAgent(BaseAgent):
         # Initialize statistical models (mock)
         self.anomaly_detector = self._initialize_anomaly_detector()
         
+        self._get_client()
+        
         self.logger.info("Fraud detection agent initialized successfully")
     
     async def _cleanup_agent(self) -> None:
         """Cleanup fraud detection resources"""
         self.logger.info("Cleaning up fraud detection resources")
+        await self._batcher.close()
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+    
+    def _reset_agent(self) -> None:
+        """Drop cached CAMARA results and start a fresh batcher"""
+        self._camara_cache.clear()
+        self._camara_inflight.clear()
+        self._camara_sem = asyncio.Semaphore(CAMARA_MAX_CONCURRENCY)
+        self._batcher = FraudBatcher(self._detect_fraud_batch, process_one=self._detect_fraud)
+    
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the pooled CAMARA client, creating it if needed"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                timeout=10.0
+            )
+        return self._client
     
     async def execute_capability(self, capability_type: str, 
                                input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Execute fraud detection capabilities"""
         
         if capability_type == "fraud_detection":
-            return await self._detect_fraud(input_data)
+            return await self._batcher.process(input_data)
         elif capability_type == "risk_scoring":
             return await self._calculate_risk_score(input_data)
         elif capability_type == "transaction_analysis":
@@ -100,6 +318,55 @@ class FraudDetectionAgent(BaseAgent):
     
     async def _detect_fraud(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Comprehensive fraud detection using multiple data sources"""
+        analysis_results = await self._run_local_checks(input_data)
+        
+        # Perform CAMARA API checks if the local checks leave the decision ambiguous
+        if self._needs_camara_checks(analysis_results, input_data):
+            camara_results = await self._perform_camara_checks(analysis_results["phone_number"])
+            self._apply_camara_results(analysis_results, camara_results)
+        
+        # Calculate overall risk score
+        risk_score = self._calculate_overall_risk_score(analysis_results)
+        return self._finalize_fraud_analysis(analysis_results, risk_score)
+    
+    async def _detect_fraud_batch(self, batch: List[Dict[str, Any]]) -> List[Any]:
+        """Detect fraud for a batch of customers; failures are returned in place of results"""
+        results = await asyncio.gather(
+            *(self._run_local_checks(input_data) for input_data in batch),
+            return_exceptions=True
+        )
+        # (analysis, whether it needs CAMARA checks) for every request that passed the local checks
+        analyzed = [
+            (analysis_results, self._needs_camara_checks(analysis_results, input_data))
+            for analysis_results, input_data in zip(results, batch)
+            if not isinstance(analysis_results, BaseException)
+        ]
+        
+        # One set of CAMARA checks per unique phone number in the batch
+        phone_numbers = list(dict.fromkeys(
+            analysis_results["phone_number"]
+            for analysis_results, needs_checks in analyzed
+            if needs_checks
+        ))
+        camara_results = dict(zip(phone_numbers, await asyncio.gather(
+            *(self._perform_camara_checks(phone_number) for phone_number in phone_numbers)
+        )))
+        
+        # Only analyses that needed the checks get them, whatever else shares the batch
+        for analysis_results, needs_checks in analyzed:
+            if needs_checks:
+                checks = camara_results[analysis_results["phone_number"]]
+                self._apply_camara_results(analysis_results, copy.deepcopy(checks))
+        
+        # Score the whole batch at once
+        risk_scores = self.score_batch([analysis_results for analysis_results, _ in analyzed])
+        for (analysis_results, _), risk_score in zip(analyzed, risk_scores):
+            self._finalize_fraud_analysis(analysis_results, risk_score)
+        
+        return results
+    
+    async def _run_local_checks(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate a fraud detection request and run the checks that need no CAMARA calls"""
         
         # Validate required inputs
         await self.validate_input(input_data, ["customer_id"])
@@ -114,7 +381,7 @@ class FraudDetectionAgent(BaseAgent):
         analysis_results = {
             "customer_id": customer_id,
             "phone_number": phone_number,
-            "analysis_timestamp": datetime.utcnow().isoformat(),
+            "analysis_timestamp": _now_iso(),
             "fraud_indicators": [],
             "risk_factors": [],
             "camara_checks": {},
@@ -123,16 +390,7 @@ class FraudDetectionAgent(BaseAgent):
             "confidence": 0.0
         }
         
-        # Perform CAMARA API checks if phone number is available
-        if phone_number:
-            camara_results = await self._perform_camara_checks(phone_number)
-            analysis_results["camara_checks"] = camara_results
-            
-            # Analyze CAMARA results for fraud indicators
-            camara_indicators = self._analyze_camara_results(camara_results)
-            analysis_results["fraud_indicators"].extend(camara_indicators)
-        
-        # Analyze transaction patterns
+        # Cheap local checks first: transaction patterns
         if transaction_data:
             transaction_analysis = await self._analyze_transaction_patterns(transaction_data)
             analysis_results["transaction_analysis"] = transaction_analysis
@@ -147,8 +405,30 @@ class FraudDetectionAgent(BaseAgent):
             behavioral_analysis.get("indicators", [])
         )
         
-        # Calculate overall risk score
-        risk_score = self._calculate_overall_risk_score(analysis_results)
+        return analysis_results
+    
+    def _needs_camara_checks(self, analysis_results: Dict[str, Any], input_data: Dict[str, Any]) -> bool:
+        """Whether CAMARA checks should run; records the skip on analysis_results when they should not"""
+        if not analysis_results["phone_number"]:
+            return False
+        
+        preliminary_score = self._calculate_overall_risk_score(analysis_results)
+        if preliminary_score <= CAMARA_SKIP_ABOVE_SCORE or input_data.get("force_camara_checks"):
+            return True
+        
+        analysis_results["camara_checks_skipped"] = True
+        return False
+    
+    def _apply_camara_results(self, analysis_results: Dict[str, Any], camara_results: Dict[str, Any]) -> None:
+        """Attach CAMARA results and their fraud indicators to an analysis"""
+        analysis_results["camara_checks"] = camara_results
+        
+        # Analyze CAMARA results for fraud indicators, ahead of the local ones
+        camara_indicators = self._analyze_camara_results(camara_results)
+        analysis_results["fraud_indicators"][:0] = camara_indicators
+    
+    def _finalize_fraud_analysis(self, analysis_results: Dict[str, Any], risk_score: float) -> Dict[str, Any]:
+        """Fill in the risk score, recommendation and explanation of an analysis"""
         analysis_results["overall_risk_score"] = risk_score
         
         # Determine recommendation
@@ -167,40 +447,28 @@ class FraudDetectionAgent(BaseAgent):
         """Perform comprehensive CAMARA API checks"""
         camara_results = {}
         
+        # Independent checks, issued concurrently
+        checks = {
+            api_type: template | {CAMARA_PHONE_KEYS[api_type]: phone_number}
+            for api_type, template in CAMARA_PAYLOAD_TEMPLATES.items()
+        }
+        
         try:
-            # Device Swap Check
-            device_swap_data = {"phone_number": phone_number, "max_age": 240}
-            device_swap_response = await self._call_camara_api(
-                "device_swap", device_swap_data
-            )
-            camara_results["device_swap"] = device_swap_response
+            async with asyncio.timeout(CAMARA_CHECKS_TIMEOUT):
+                responses = await asyncio.gather(
+                    *(self._call_camara_api(api_type, data) for api_type, data in checks.items()),
+                    return_exceptions=True
+                )
             
-            # SIM Swap Check
-            sim_swap_data = {"phone_number": phone_number, "max_age": 240}
-            sim_swap_response = await self._call_camara_api(
-                "sim_swap", sim_swap_data
-            )
-            camara_results["sim_swap"] = sim_swap_response
-            
-            # Location Check
-            location_data = {"device": phone_number, "max_age": 60}
-            location_response = await self._call_camara_api(
-                "location", location_data
-            )
-            camara_results["location"] = location_response
-            
-            # Scam Signal Check
-            scam_data = {
-                "phone_number": phone_number,
-                "analysis_period_hours": 24,
-                "include_call_patterns": True,
-                "include_message_patterns": True
-            }
-            scam_response = await self._call_camara_api(
-                "scam_signal", scam_data
-            )
-            camara_results["scam_signal"] = scam_response
+            for api_type, response in zip(checks, responses):
+                if isinstance(response, Exception):
+                    self.logger.error(f"CAMARA API {api_type} failed: {response}")
+                    response = {"error": str(response)}
+                camara_results[api_type] = response
             
+        except asyncio.TimeoutError:
+            self.logger.warning(f"CAMARA API checks timed out after {CAMARA_CHECKS_TIMEOUT}s")
+            camara_results["error"] = "camara_timeout"
         except Exception as e:
             self.logger.error(f"CAMARA API checks failed: {e}")
             camara_results["error"] = str(e)
@@ -208,24 +476,83 @@ class FraudDetectionAgent(BaseAgent):
         return camara_results
     
     async def _call_camara_api(self, api_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Make API call to CAMARA endpoint, reusing recent results for the same phone number"""
+        ttl = CAMARA_CACHE_TTL.get(api_type)
+        phone_number = data.get("phone_number") or data.get("device")
+        if ttl is None or not phone_number:
+            return await self._fetch_camara_api(api_type, data)
+        
+        key = (api_type, phone_number)
+        cached = self._camara_cache.get(key)
+        # Callers own the returned dict, so cached and shared responses are copied
+        if cached is not None and time.monotonic() - cached[0] < ttl:
+            return copy.deepcopy(cached[1])
+        
+        # Concurrent misses for the same key share one upstream call
+        task = self._camara_inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_and_cache(key, api_type, data))
+            self._camara_inflight[key] = task
+            task.add_done_callback(lambda _: self._camara_inflight.pop(key, None))
+        
+        # Shielded so one cancelled caller does not cancel the call for the others
+        return copy.deepcopy(await asyncio.shield(task))
+    
+    async def _fetch_and_cache(self, key: Tuple[str, str], api_type: str,
+                               data: Dict[str, Any]) -> Dict[str, Any]:
+        """Fetch a CAMARA result and cache it unless it is an error"""
+        response = await self._fetch_camara_api(api_type, data)
+        if "error" not in response:
+            self._camara_cache[key] = (time.monotonic(), response)
+            self._camara_cache.move_to_end(key)
+            if len(self._camara_cache) > CAMARA_CACHE_MAX_ENTRIES:
+                self._camara_cache.popitem(last=False)
+        return response
+    
+    async def _fetch_camara_api(self, api_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
         """Make API call to CAMARA endpoint"""
         endpoint = self.camara_endpoints.get(api_type)
-        if not endpoint:
+        if endpoint is None:
             raise ValueError(f"Unknown CAMARA API type: {api_type}")
         
-        try:
-            async with httpx.AsyncClient() as client:
-                response = await client.post(endpoint, json=data, timeout=10.0)
+        content = orjson.dumps(data)
+        for attempt in range(CAMARA_MAX_ATTEMPTS):
+            try:
+                async with self._camara_sem:
+                    response = await self._get_client().post(
+                        endpoint,
+                        content=content,
+                        headers={"content-type": "application/json"}
+                    )
                 response.raise_for_status()
-                return response.json()
-        except httpx.HTTPError as e:
-            self.logger.error(f"CAMARA API {api_type} failed: {e}")
-            return {"error": str(e)}
+                return orjson.loads(response.content)
+            except httpx.HTTPError as e:
+                # Connection failures and 5xx responses are transient; 4xx are not
+                retriable = isinstance(e, httpx.TransportError) or (
+                    isinstance(e, httpx.HTTPStatusError) and e.response.status_code >= 500
+                )
+                if not retriable or attempt == CAMARA_MAX_ATTEMPTS - 1:
+                    self.logger.error(f"CAMARA API {api_type} failed: {e}")
+                    return {"error": str(e)}
+                
+                # Exponential backoff with jitter: ~50ms, then ~100ms
+                self.logger.warning(f"CAMARA API {api_type} attempt {attempt + 1} failed, retrying: {e}")
+                await asyncio.sleep(CAMARA_RETRY_BASE_DELAY * 2 ** attempt + random.random() * 0.02)
     
     def _analyze_camara_results(self, camara_results: Dict[str, Any]) -> List[Dict[str, Any]]:
         """Analyze CAMARA API results for fraud indicators"""
         indicators = []
         
+        # CAMARA unavailable within the time budget: degrade to a weak signal
+        if camara_results.get("error") == "camara_timeout":
+            indicators.append({
+                "type": "camara_timeout",
+                "severity": "low",
+                "confidence": 0.5,
+                "details": f"CAMARA checks did not complete within {CAMARA_CHECKS_TIMEOUT}s",
+                "source": "camara"
+            })
+        
         # Analyze Device Swap results
         device_swap = camara_results.get("device_swap", {})
         if device_swap.get("swapped") and device_swap.get("confidence", 0) > 0.7:
@@ -330,8 +657,11 @@ class FraudDetectionAgent(BaseAgent):
         # Mock behavioral analysis
         customer_id = input_data["customer_id"]
         
-        # Simulate different behavioral patterns based on customer ID
-        if hash(customer_id) % 10 < 2:  # 20% chance of suspicious behavior
+        # Simulate different behavioral patterns based on customer ID; crc32 is stable
+        # across processes (unlike hash()) and each gate reads its own byte of it
+        customer_hash = zlib.crc32(str(customer_id).encode())
+        
+        if customer_hash & 0xFF < 51:  # 20% chance of suspicious behavior
             analysis["indicators"].append({
                 "type": "unusual_login_pattern",
                 "severity": "medium",
@@ -341,7 +671,7 @@ class FraudDetectionAgent(BaseAgent):
             })
             analysis["behavioral_score"] += 0.3
         
-        if hash(customer_id) % 15 < 1:  # ~7% chance of high-risk behavior
+        if (customer_hash >> 8) & 0xFF < 17:  # ~7% chance of high-risk behavior
             analysis["indicators"].append({
                 "type": "rapid_successive_actions",
                 "severity": "high",
@@ -358,19 +688,30 @@ class FraudDetectionAgent(BaseAgent):
         base_score = 0.1  # Baseline risk
         
         # Weight fraud indicators
-        for indicator in analysis_results["fraud_indicators"]:
-            severity = indicator.get("severity", "low")
-            confidence = indicator.get("confidence", 0.5)
-            
-            severity_weights = {
-                "low": 0.1,
-                "medium": 0.3,
-                "high": 0.5,
-                "critical": 0.8
-            }
-            
-            weight = severity_weights.get(severity, 0.1)
-            base_score += weight * confidence
+        base_score += sum(map(_indicator_weight, analysis_results["fraud_indicators"]))
+        base_score += self._signal_risk_score(analysis_results)
+        
+        return min(1.0, base_score)
+    
+    def score_batch(self, batch: List[Dict[str, Any]]) -> List[float]:
+        """Calculate overall fraud risk scores for many analysis results at once"""
+        max_indicators = max((len(results["fraud_indicators"]) for results in batch), default=0)
+        severities = np.zeros((len(batch), max_indicators), dtype=np.int8)
+        confidences = np.zeros((len(batch), max_indicators), dtype=np.float64)
+        signal_scores = np.empty(len(batch), dtype=np.float64)
+        
+        for row, results in enumerate(batch):
+            for col, indicator in enumerate(results["fraud_indicators"]):
+                severities[row, col] = SEVERITY_INDEX.get(indicator.get("severity", "low"), 0)
+                confidences[row, col] = indicator.get("confidence", 0.5)
+            signal_scores[row] = self._signal_risk_score(results)
+        
+        indicator_scores = (SEVERITY_WEIGHT_ARRAY[severities] * confidences).sum(axis=1)
+        return np.minimum(1.0, 0.1 + indicator_scores + signal_scores).tolist()
+    
+    def _signal_risk_score(self, analysis_results: Dict[str, Any]) -> float:
+        """Risk contributed by CAMARA and behavioral signals"""
+        base_score = 0.0
         
         # Factor in CAMARA results
         camara_checks = analysis_results.get("camara_checks", {})
@@ -388,15 +729,20 @@ class FraudDetectionAgent(BaseAgent):
         behavioral = analysis_results.get("behavioral_analysis", {})
         base_score += behavioral.get("behavioral_score", 0) * 0.4
         
-        return min(1.0, base_score)
+        return base_score
     
     def _determine_fraud_recommendation(self, risk_score: float, 
                                       indicators: List[Dict[str, Any]]) -> tuple[str, float]:
         """Determine fraud prevention recommendation"""
         
-        # Count critical and high severity indicators
-        critical_count = sum(1 for ind in indicators if ind.get("severity") == "critical")
-        high_count = sum(1 for ind in indicators if ind.get("severity") == "high")
+        # Count critical and high severity indicators in a single pass
+        critical_count = high_count = 0
+        for ind in indicators:
+            severity = ind.get("severity")
+            if severity == "critical":
+                critical_count += 1
+            elif severity == "high":
+                high_count += 1
         
         if risk_score > 0.9 or critical_count >= 2:
             return "block", 0.95
@@ -413,22 +759,28 @@ class FraudDetectionAgent(BaseAgent):
         recommendation = analysis_results["recommendation"]
         indicators = analysis_results["fraud_indicators"]
         
-        explanation = f"Fraud analysis completed with risk score {risk_score:.2f}. "
-        explanation += f"Recommendation: {recommendation.upper()}. "
+        parts = [
+            f"Fraud analysis completed with risk score {risk_score:.2f}. ",
+            f"Recommendation: {recommendation.upper()}. "
+        ]
         
         if indicators:
-            explanation += f"Found {len(indicators)} fraud indicators: "
-            indicator_summaries = []
-            for ind in indicators[:3]:  # Top 3 indicators
-                indicator_summaries.append(f"{ind['type']} ({ind['severity']} severity)")
-            explanation += ", ".join(indicator_summaries)
+            parts.append(f"Found {len(indicators)} fraud indicators: ")
+            # Top 3 indicators by their contribution to the risk score
+            parts.append(", ".join(
+                f"{ind['type']} ({ind['severity']} severity)"
+                for ind in heapq.nlargest(3, indicators, key=_indicator_weight)
+            ))
             
             if len(indicators) > 3:
-                explanation += f" and {len(indicators) - 3} others"
+                parts.append(f" and {len(indicators) - 3} others")
         else:
-            explanation += "No significant fraud indicators detected."
+            parts.append("No significant fraud indicators detected.")
+        
+        if analysis_results.get("camara_checks_skipped"):
+            parts.append(" CAMARA checks skipped: local checks were conclusive.")
         
-        return explanation
+        return "".join(parts)
     
     async def _calculate_risk_score(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Calculate detailed risk score breakdown"""
@@ -436,17 +788,11 @@ class FraudDetectionAgent(BaseAgent):
         # Simplified risk scoring for demonstration
         base_risk = 0.2
         
-        # Factor in various risk components
-        risk_components = {
-            "account_age": random.uniform(0.0, 0.2),
-            "transaction_history": random.uniform(0.0, 0.3),
-            "device_trust": random.uniform(0.0, 0.4),
-            "location_consistency": random.uniform(0.0, 0.2),
-            "behavioral_patterns": random.uniform(0.0, 0.3)
-        }
+        # Factor in various risk components, drawn in one call
+        component_values = _RNG.random(len(RISK_COMPONENT_KEYS)) * RISK_COMPONENT_SCALES
+        risk_components = dict(zip(RISK_COMPONENT_KEYS, component_values.tolist()))
         
-        total_risk = base_risk + sum(risk_components.values())
-        total_risk = min(1.0, total_risk)
+        total_risk = min(1.0, base_risk + float(component_values.sum()))
         
         return {
             "overall_risk_score": total_risk,
@@ -472,22 +818,26 @@ class FraudDetectionAgent(BaseAgent):
     async def _recognize_patterns(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         """Recognize fraud patterns in data"""
         
-        patterns_found = []
+        # Mock pattern recognition: 20% chance each pattern is found, drawn in bulk
+        hit_idx = np.nonzero(_RNG.random(len(self._pattern_names)) < 0.2)[0]
+        confidences = _RNG.uniform(0.6, 0.95, len(hit_idx))
         
-        # Mock pattern recognition
-        for pattern_name, pattern_config in self.fraud_patterns.items():
-            if random.random() < 0.2:  # 20% chance each pattern is found
-                patterns_found.append({
-                    "pattern_name": pattern_name,
-                    "confidence": random.uniform(0.6, 0.95),
-                    "indicators": pattern_config["indicators"],
-                    "weight": pattern_config["weight"]
-                })
+        patterns_found = [
+            {
+                "pattern_name": self._pattern_names[i],
+                "confidence": confidence,
+                "indicators": self._pattern_indicators[i],
+                "weight": weight
+            }
+            for i, confidence, weight in zip(
+                hit_idx.tolist(), confidences.tolist(), self._pattern_weights[hit_idx].tolist()
+            )
+        ]
         
         return {
             "patterns_detected": patterns_found,
             "pattern_count": len(patterns_found),
-            "highest_confidence": max([p["confidence"] for p in patterns_found]) if patterns_found else 0.0
+            "highest_confidence": max(confidences.tolist(), default=0.0)
         }
     
     def _get_risk_level(self, risk_score: float) -> str:
@@ -528,5 +878,5 @@ class FraudDetectionAgent(BaseAgent):
             "camara_endpoints_status": "operational",
             "fraud_models_loaded": True,
             "rule_engine_status": "active",
-            "last_model_update": datetime.utcnow().isoformat()
+            "last_model_update": _now_iso()
         }
\ No newline at end of file
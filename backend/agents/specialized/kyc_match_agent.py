@@ -1,32 +1,174 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Optional, Tuple
 import asyncio
+import bisect
+import copy
+import hashlib
+from collections import OrderedDict
 import httpx
-from datetime import datetime
+import orjson
+from datetime import date
+import random
 import re
+import time
 
 from ..base.base_agent import BaseAgent
 
 
+# Seconds a KYC match response stays valid, and the most responses kept
+KYC_CACHE_TTL = 600
+KYC_CACHE_MAX_ENTRIES = 10_000
+
+# Outbound KYC match calls in flight, attempts per call, and retry delay bounds (seconds)
+KYC_MAX_CONCURRENCY = 64
+KYC_MAX_ATTEMPTS = 4
+KYC_RETRY_BASE_DELAY = 0.1
+KYC_RETRY_MAX_DELAY = 2.0
+
+# Document batches at least this large are format/checksum validated off the event loop
+DOC_VALIDATION_OFFLOAD_THRESHOLD = 64
+
+# Basic document number format patterns, by lowercase document type
+_DOC_PATTERNS = {
+    doc_type: re.compile(pattern)
+    for doc_type, pattern in {
+        "passport": r"^[A-Z]{1,2}[0-9]{6,9}$",
+        "driver_license": r"^[A-Z0-9]{8,12}$",
+        "national_id": r"^[0-9]{9,12}$",
+        "ssn": r"^[0-9]{3}-[0-9]{2}-[0-9]{4}$"
+    }.items()
+}
+# Normalizes a document number for the patterns in one pass: drops spaces, uppercases ASCII letters
+_DOC_NORMALIZE = str.maketrans({" ": None, **{chr(c): chr(c - 32) for c in range(ord("a"), ord("z") + 1)}})
+
+# Byte translation tables mapping ASCII digits to their Luhn value as-is and doubled
+_LUHN_DIGITS = bytes.maketrans(b"0123456789", bytes(range(10)))
+_LUHN_DOUBLED = bytes.maketrans(b"0123456789", bytes([0, 2, 4, 6, 8, 1, 3, 5, 7, 9]))
+
+
 class KYCMatchAgent(BaseAgent):
+    # (CAMARA KYC match field, verification_data key) pairs, in request order
+    _KYC_FIELD_MAP = (
+        ("idDocument", "id_document"),
+        ("name", "name"),
+        ("givenName", "given_name"),
+        ("familyName", "family_name"),
+        ("nameKana", "name_kana"),
+        ("givenNameKana", "given_name_kana"),
+        ("familyNameKana", "family_name_kana"),
+        ("birthdate", "birthdate"),
+        ("email", "email"),
+        ("address", "address"),
+        ("houseNumber", "house_number"),
+        ("street", "street"),
+        ("city", "city"),
+        ("region", "region"),
+        ("country", "country"),
+        ("postalCode", "postal_code")
+    )
+    # One bit per CAMARA KYC field, and the mask of fields that carry most of the identity evidence
+    _FIELD_BITS = {camara_key: 1 << i for i, (camara_key, _) in enumerate(_KYC_FIELD_MAP)}
+    _CRITICAL_MASK = _FIELD_BITS["name"] | _FIELD_BITS["birthdate"] | _FIELD_BITS["idDocument"]
+    # (requirement, check method, issue when unmet, whether unmet is non-compliant)
+    _COMPLIANCE_CHECKS = (
+        ("identity_verification", "_check_identity_verified", "identity_verification_missing", True),
+        ("document_validation", "_check_documents_validated", "document_validation_missing", True),
+        ("address_verification", "_check_address_verified", "address_verification_recommended", False),
+        ("age_verification", "_check_minimum_age", "age_verification_failed", True)
+    )
+    # Recommendation for each failed compliance check, in output order
+    _COMPLIANCE_RECOMMENDATIONS = (
+        ("identity_verification_missing", "Complete identity verification process immediately"),
+        ("document_validation_missing", "Validate customer identification documents"),
+        ("age_verification_failed", "Customer does not meet minimum age requirements")
+    )
+    # Upper bound of each low match score band, and the risk and factor each band adds
+    _MATCH_SCORE_CUTOFFS = (0.3, 0.6)
+    _MATCH_SCORE_RISK = (
+        (0.8, "Very low identity match score"),
+        (0.4, "Low identity match score"),
+        (0.0, None)
+    )
+    # Lower bound of each risk level above MINIMAL
+    _RISK_CUTOFFS = (0.2, 0.5, 0.8)
+    _RISK_NAMES = ("MINIMAL", "LOW", "MEDIUM", "HIGH")
+    # Lower bound of each match score band above the lowest, and each band's recommendations
+    _RECOMMENDATION_CUTOFFS = (0.3, 0.6, 0.8)
+    _VERIFICATION_RECOMMENDATIONS = (
+        (
+            "REJECT: Identity verification failed",
+            "Request alternative identification documents",
+            "Consider manual verification process",
+            "Flag account for enhanced monitoring"
+        ),
+        (
+            "Request additional verification documents",
+            "Perform secondary identity checks",
+            "Limit account privileges until full verification",
+            "Monitor for suspicious activities"
+        ),
+        (
+            "Consider requesting supplementary documentation",
+            "Apply standard monitoring procedures",
+            "Document verification attempt for audit trail"
+        ),
+        (
+            "APPROVE: Identity successfully verified",
+            "Proceed with normal account provisioning",
+            "Maintain standard monitoring protocols"
+        )
+    )
+    
     def __init__(self):
         super().__init__(
             agent_id="kyc_match_agent",
             name="KYC Match Verification Agent",
             description="Specialized agent for identity verification using CAMARA KYC Match API",
-            capabilities=["identity_verification", "document_validation", "compliance_check"]
+            capabilities=["identity_verification", "identity_verification_batch", "document_validation", "compliance_check"]
         )
         
         self.camara_base_url = "http://localhost:8001/camara"
         
+        # Pooled CAMARA client shared by all KYC calls
+        self._client: Optional[httpx.AsyncClient] = None
+        self._kyc_sem = asyncio.Semaphore(KYC_MAX_CONCURRENCY)
+        
+        # Request digest -> (fetched_at, response), oldest first
+        self._kyc_cache: OrderedDict[bytes, Tuple[float, Dict[str, Any]]] = OrderedDict()
+        # Request digest -> KYC match call currently in flight
+        self._kyc_inflight: Dict[bytes, asyncio.Future] = {}
+        
     async def _initialize_agent(self) -> None:
         self.logger.info("Initializing KYC Match Agent")
+        self._get_client()
         
     async def _cleanup_agent(self) -> None:
         self.logger.info("Cleaning up KYC Match Agent")
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            
+    def _reset_agent(self) -> None:
+        """Drop cached KYC match results"""
+        self._kyc_cache.clear()
+        self._kyc_inflight.clear()
+        self._kyc_sem = asyncio.Semaphore(KYC_MAX_CONCURRENCY)
+        
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the pooled CAMARA client, creating it if needed"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.camara_base_url,
+                http2=True,
+                limits=httpx.Limits(max_connections=64, max_keepalive_connections=32),
+                timeout=httpx.Timeout(10.0, connect=2.0)
+            )
+        return self._client
         
     async def execute_capability(self, capability_type: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
         if capability_type == "identity_verification":
             return await self._verify_identity(input_data)
+        elif capability_type == "identity_verification_batch":
+            return await self._verify_identity_batch(input_data)
         elif capability_type == "document_validation":
             return await self._validate_documents(input_data)
         elif capability_type == "compliance_check":
@@ -43,50 +185,30 @@ class KYCMatchAgent(BaseAgent):
         self.logger.info(f"Performing identity verification for {phone_number}")
         
         try:
-            # Prepare KYC match request
-            kyc_request = {
-                "phoneNumber": phone_number,
-                "idDocument": verification_data.get("id_document", ""),
-                "name": verification_data.get("name", ""),
-                "givenName": verification_data.get("given_name", ""),
-                "familyName": verification_data.get("family_name", ""),
-                "nameKana": verification_data.get("name_kana", ""),
-                "givenNameKana": verification_data.get("given_name_kana", ""),
-                "familyNameKana": verification_data.get("family_name_kana", ""),
-                "birthdate": verification_data.get("birthdate", ""),
-                "email": verification_data.get("email", ""),
-                "address": verification_data.get("address", ""),
-                "houseNumber": verification_data.get("house_number", ""),
-                "street": verification_data.get("street", ""),
-                "city": verification_data.get("city", ""),
-                "region": verification_data.get("region", ""),
-                "country": verification_data.get("country", ""),
-                "postalCode": verification_data.get("postal_code", "")
-            }
+            # Prepare KYC match request with the non-empty verification fields
+            kyc_request = {"phoneNumber": phone_number}
+            kyc_request.update(
+                (camara_key, value) for camara_key, input_key in self._KYC_FIELD_MAP
+                if (value := verification_data.get(input_key))
+            )
             
-            # Remove empty fields
-            kyc_request = {k: v for k, v in kyc_request.items() if v}
+            kyc_result = await self._kyc_match(kyc_request)
+            match_status = kyc_result.get("match", "unknown")
+            match_score = float(kyc_result.get("matchScore", 0.0))
+            matched_fields = kyc_result.get("matchedFields") or {}
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.camara_base_url}/kyc-match/v1/match",
-                    json=kyc_request
-                )
-                response.raise_for_status()
-                kyc_result = response.json()
-                
             # Analyze verification results
-            verification_analysis = self._analyze_verification_results(kyc_result, verification_data)
+            verification_analysis = self._analyze_verification_results(match_status, match_score, matched_fields)
             
             return {
                 "phone_number": phone_number,
-                "verification_status": kyc_result.get("match", "unknown"),
-                "match_score": kyc_result.get("matchScore", 0.0),
-                "field_matches": kyc_result.get("matchedFields", {}),
+                "verification_status": match_status,
+                "match_score": match_score,
+                "field_matches": matched_fields,
                 "verification_analysis": verification_analysis,
-                "risk_assessment": self._assess_identity_risk(kyc_result, verification_analysis),
+                "risk_assessment": self._assess_identity_risk(match_score, matched_fields, verification_analysis),
                 "confidence": 0.89,
-                "recommendations": self._generate_verification_recommendations(kyc_result)
+                "recommendations": self._generate_verification_recommendations(match_score)
             }
             
         except Exception as e:
@@ -97,48 +219,72 @@ class KYCMatchAgent(BaseAgent):
                 "confidence": 0.0
             }
             
+    async def _verify_identity_batch(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
+        await self.validate_input(input_data, ["items"])
+        
+        items = input_data["items"]
+        if not isinstance(items, list):
+            raise ValueError("items must be a list")
+        self.logger.info(f"Performing batch identity verification for {len(items)} items")
+        
+        # Verifications share the pooled client, KYC cache and call limit; order follows items
+        results = await asyncio.gather(*(self._verify_batch_item(item) for item in items))
+        
+        return {
+            "results": results,
+            "total": len(items),
+            "failed": sum(1 for result in results if "error" in result)
+        }
+        
+    async def _verify_batch_item(self, item: Any) -> Dict[str, Any]:
+        """Verify one batch item, reporting a malformed item or failure as its error result"""
+        phone_number = item.get("phone_number") if isinstance(item, dict) else None
+        try:
+            if not isinstance(item, dict):
+                raise ValueError(f"Batch item must be an object, got {type(item).__name__}")
+            return await self._verify_identity(item)
+        except Exception as e:
+            return {
+                "phone_number": phone_number,
+                "error": f"Identity verification failed: {str(e)}",
+                "confidence": 0.0
+            }
+            
     async def _validate_documents(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         await self.validate_input(input_data, ["documents"])
         
         documents = input_data["documents"]
         phone_number = input_data.get("phone_number")
         
-        validation_results = []
-        
-        for doc in documents:
-            doc_type = doc.get("type", "unknown")
-            doc_number = doc.get("number", "")
+        # If phone number provided, check all documents against KYC records concurrently;
+        # the lookups start now and overlap with the local format and checksum validation
+        kyc_lookups = None
+        if phone_number:
+            # Canonical (sorted-key) bodies assembled around the phone number encoded once
+            phone_suffix = b',"phoneNumber":' + orjson.dumps(phone_number) + b'}'
+            kyc_lookups = asyncio.gather(*(
+                self._kyc_match_content(b'{"idDocument":' + orjson.dumps(doc.get("number", "")) + phone_suffix)
+                for doc in documents
+            ), return_exceptions=True)
             
-            validation = {
-                "document_type": doc_type,
-                "document_number": doc_number,
-                "format_valid": self._validate_document_format(doc_type, doc_number),
-                "checksum_valid": self._validate_checksum(doc_type, doc_number)
-            }
-            
-            # If phone number provided, check against KYC records
-            if phone_number:
-                try:
-                    async with httpx.AsyncClient() as client:
-                        response = await client.post(
-                            f"{self.camara_base_url}/kyc-match/v1/match",
-                            json={
-                                "phoneNumber": phone_number,
-                                "idDocument": doc_number
-                            }
-                        )
-                        response.raise_for_status()
-                        kyc_result = response.json()
-                        
-                    validation["kyc_match"] = kyc_result.get("match", "unknown")
-                    validation["match_confidence"] = kyc_result.get("matchScore", 0.0)
-                    
-                except Exception:
-                    validation["kyc_match"] = "error"
-                    validation["match_confidence"] = 0.0
-                    
-            validation_results.append(validation)
+        # Large batches are validated in a worker thread to keep the event loop responsive
+        if len(documents) >= DOC_VALIDATION_OFFLOAD_THRESHOLD:
+            validation_results = await asyncio.get_running_loop().run_in_executor(
+                None, lambda: [self._validate_document_sync(doc) for doc in documents]
+            )
+        else:
+            validation_results = [self._validate_document_sync(doc) for doc in documents]
             
+        kyc_lookups = await kyc_lookups if kyc_lookups is not None else []
+        
+        for validation, kyc_result in zip(validation_results, kyc_lookups):
+            if isinstance(kyc_result, Exception):
+                validation["kyc_match"] = "error"
+                validation["match_confidence"] = 0.0
+            else:
+                validation["kyc_match"] = kyc_result.get("match", "unknown")
+                validation["match_confidence"] = kyc_result.get("matchScore", 0.0)
+                
         overall_validity = all(doc.get("format_valid", False) for doc in validation_results)
         
         return {
@@ -149,12 +295,83 @@ class KYCMatchAgent(BaseAgent):
             "recommendations": self._generate_document_recommendations(validation_results)
         }
         
+    def _validate_document_sync(self, doc: Dict[str, Any]) -> Dict[str, Any]:
+        doc_type = doc.get("type", "unknown")
+        doc_number = doc.get("number", "")
+        
+        return {
+            "document_type": doc_type,
+            "document_number": doc_number,
+            "format_valid": self._validate_document_format(doc_type, doc_number),
+            "checksum_valid": self._validate_checksum(doc_type, doc_number)
+        }
+        
+    async def _kyc_match(self, kyc_request: Dict[str, Any]) -> Dict[str, Any]:
+        """Call the CAMARA KYC match API, reusing recent results for identical requests"""
+        # The canonical (sorted) encoding is both the cache key source and the request body
+        return await self._kyc_match_content(orjson.dumps(kyc_request, option=orjson.OPT_SORT_KEYS))
+        
+    async def _kyc_match_content(self, content: bytes) -> Dict[str, Any]:
+        """Call the CAMARA KYC match API with an already canonically encoded request body"""
+        key = hashlib.blake2b(content, digest_size=16).digest()
+        # Callers own the returned dict (field_matches is passed through), so cached and shared results are copied
+        cached = self._kyc_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < KYC_CACHE_TTL:
+            return copy.deepcopy(cached[1])
+            
+        # Concurrent misses for the same request share one upstream call
+        task = self._kyc_inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_kyc_match(key, content))
+            self._kyc_inflight[key] = task
+            task.add_done_callback(lambda _: self._kyc_inflight.pop(key, None))
+            
+        # Shielded so one cancelled caller does not cancel the call for the others
+        return copy.deepcopy(await asyncio.shield(task))
+        
+    async def _fetch_kyc_match(self, key: bytes, content: bytes) -> Dict[str, Any]:
+        """Fetch a KYC match result and cache it; failures raise and are not cached"""
+        for attempt in range(KYC_MAX_ATTEMPTS):
+            try:
+                async with self._kyc_sem:
+                    response = await self._get_client().post(
+                        "/kyc-match/v1/match",
+                        content=content,
+                        headers={"content-type": "application/json"}
+                    )
+                response.raise_for_status()
+                break
+            except httpx.HTTPError as e:
+                # Connection failures, throttling and 5xx responses are transient; other 4xx are not
+                status = e.response.status_code if isinstance(e, httpx.HTTPStatusError) else None
+                retriable = isinstance(e, httpx.TransportError) or status == 429 or (status or 0) >= 500
+                if not retriable or attempt == KYC_MAX_ATTEMPTS - 1:
+                    raise
+                
+                # Exponential backoff with jitter, or the server's Retry-After when it sends seconds
+                delay = KYC_RETRY_BASE_DELAY * 2 ** attempt + random.random() * KYC_RETRY_BASE_DELAY
+                retry_after = e.response.headers.get("retry-after", "") if status == 429 else ""
+                if retry_after.isdigit():
+                    delay = int(retry_after)
+                delay = min(delay, KYC_RETRY_MAX_DELAY)
+                self.logger.warning(f"KYC match attempt {attempt + 1} failed, retrying in {delay:.2f}s: {e}")
+                await asyncio.sleep(delay)
+                
+        kyc_result = orjson.loads(response.content)
+        
+        self._kyc_cache[key] = (time.monotonic(), kyc_result)
+        self._kyc_cache.move_to_end(key)
+        if len(self._kyc_cache) > KYC_CACHE_MAX_ENTRIES:
+            self._kyc_cache.popitem(last=False)
+        return kyc_result
+        
     async def _perform_compliance_check(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         await self.validate_input(input_data, ["phone_number", "compliance_requirements"])
         
         phone_number = input_data["phone_number"]
         requirements = input_data["compliance_requirements"]
         customer_data = input_data.get("customer_data", {})
+        fail_fast = input_data.get("fail_fast", False)
         
         compliance_results = {
             "phone_number": phone_number,
@@ -164,37 +381,26 @@ class KYCMatchAgent(BaseAgent):
             "requirements_met": []
         }
         
-        # Check identity verification requirement
-        if "identity_verification" in requirements:
-            if customer_data.get("identity_verified"):
-                compliance_results["requirements_met"].append("identity_verification")
-            else:
-                compliance_results["failed_checks"].append("identity_verification_missing")
-                compliance_results["compliance_status"] = "non_compliant"
-                
-        # Check document validation requirement
-        if "document_validation" in requirements:
-            if customer_data.get("documents_validated"):
-                compliance_results["requirements_met"].append("document_validation")
-            else:
-                compliance_results["failed_checks"].append("document_validation_missing")
+        # Independent requirement checks run concurrently; results come back in table order
+        checks = [check for check in self._COMPLIANCE_CHECKS if check[0] in requirements]
+        if fail_fast:
+            outcomes = await self._run_compliance_checks_fail_fast(checks, customer_data, requirements)
+        else:
+            outcomes = await asyncio.gather(*(
+                getattr(self, check_name)(customer_data, requirements) for _, check_name, _, _ in checks
+            ))
+            
+        for (requirement, _, issue, blocking), passed in zip(checks, outcomes):
+            if passed is None:
+                # Cancelled after an earlier blocking failure
+                continue
+            if passed:
+                compliance_results["requirements_met"].append(requirement)
+            elif blocking:
+                compliance_results["failed_checks"].append(issue)
                 compliance_results["compliance_status"] = "non_compliant"
-                
-        # Check address verification
-        if "address_verification" in requirements:
-            if customer_data.get("address_verified"):
-                compliance_results["requirements_met"].append("address_verification")
             else:
-                compliance_results["warnings"].append("address_verification_recommended")
-                
-        # Check age verification
-        if "age_verification" in requirements:
-            birthdate = customer_data.get("birthdate")
-            if birthdate and self._verify_minimum_age(birthdate, requirements.get("minimum_age", 18)):
-                compliance_results["requirements_met"].append("age_verification")
-            else:
-                compliance_results["failed_checks"].append("age_verification_failed")
-                compliance_results["compliance_status"] = "non_compliant"
+                compliance_results["warnings"].append(issue)
                 
         return {
             **compliance_results,
@@ -202,42 +408,69 @@ class KYCMatchAgent(BaseAgent):
             "recommendations": self._generate_compliance_recommendations(compliance_results)
         }
         
-    def _analyze_verification_results(self, kyc_result: Dict[str, Any], 
-                                    verification_data: Dict[str, Any]) -> Dict[str, Any]:
-        match_status = kyc_result.get("match", "unknown")
-        match_score = kyc_result.get("matchScore", 0.0)
-        matched_fields = kyc_result.get("matchedFields", {})
+    async def _run_compliance_checks_fail_fast(self, checks: List[Tuple[str, str, str, bool]],
+                                               customer_data: Dict[str, Any],
+                                               requirements: Dict[str, Any]) -> List[Optional[bool]]:
+        """Run compliance checks concurrently, cancelling the rest once a blocking check fails"""
+        tasks = [
+            asyncio.ensure_future(getattr(self, check_name)(customer_data, requirements))
+            for _, check_name, _, _ in checks
+        ]
+        blocking = {task: check[3] for task, check in zip(tasks, checks)}
+        
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            if any(blocking[task] and not task.result() for task in done):
+                for task in pending:
+                    task.cancel()
+                break
+                
+        # None marks checks cancelled before they finished
+        return [task.result() if task.done() and not task.cancelled() else None for task in tasks]
+        
+    async def _check_identity_verified(self, customer_data: Dict[str, Any], requirements: Dict[str, Any]) -> bool:
+        return bool(customer_data.get("identity_verified"))
+        
+    async def _check_documents_validated(self, customer_data: Dict[str, Any], requirements: Dict[str, Any]) -> bool:
+        return bool(customer_data.get("documents_validated"))
+        
+    async def _check_address_verified(self, customer_data: Dict[str, Any], requirements: Dict[str, Any]) -> bool:
+        return bool(customer_data.get("address_verified"))
         
+    async def _check_minimum_age(self, customer_data: Dict[str, Any], requirements: Dict[str, Any]) -> bool:
+        birthdate = customer_data.get("birthdate")
+        return bool(birthdate) and self._verify_minimum_age(birthdate, requirements.get("minimum_age", 18))
+        
+    def _analyze_verification_results(self, match_status: str, match_score: float,
+                                    matched_fields: Dict[str, Any]) -> Dict[str, Any]:
         analysis = {
             "overall_match": match_status,
             "confidence_score": match_score,
-            "matched_attributes": list(matched_fields.keys()),
+            "matched_attributes": list(matched_fields),
             "verification_strength": "strong" if match_score > 0.8 else "moderate" if match_score > 0.5 else "weak"
         }
         
         # Analyze specific field matches
-        critical_fields = ["name", "birthdate", "idDocument"]
-        critical_matches = sum(1 for field in critical_fields if matched_fields.get(field) == "true")
+        field_bits = self._FIELD_BITS
+        true_mask = sum(field_bits.get(field, 0) for field, value in matched_fields.items() if value == "true")
+        critical_matches = (true_mask & self._CRITICAL_MASK).bit_count()
         
         analysis["critical_field_matches"] = critical_matches
-        analysis["critical_match_ratio"] = critical_matches / len(critical_fields)
+        analysis["critical_match_ratio"] = critical_matches / self._CRITICAL_MASK.bit_count()
         
         return analysis
         
-    def _assess_identity_risk(self, kyc_result: Dict[str, Any], 
+    def _assess_identity_risk(self, match_score: float, matched_fields: Dict[str, Any],
                             analysis: Dict[str, Any]) -> Dict[str, Any]:
         risk_score = 0.0
         risk_factors = []
         
-        match_score = kyc_result.get("matchScore", 0.0)
-        
         # Low match score increases risk
-        if match_score < 0.3:
-            risk_score += 0.8
-            risk_factors.append("Very low identity match score")
-        elif match_score < 0.6:
-            risk_score += 0.4
-            risk_factors.append("Low identity match score")
+        band_risk, band_factor = self._MATCH_SCORE_RISK[bisect.bisect_right(self._MATCH_SCORE_CUTOFFS, match_score)]
+        if band_factor:
+            risk_score += band_risk
+            risk_factors.append(band_factor)
             
         # Missing critical field matches
         critical_ratio = analysis.get("critical_match_ratio", 0.0)
@@ -246,8 +479,7 @@ class KYCMatchAgent(BaseAgent):
             risk_factors.append("Missing critical identity field matches")
             
         # Partial matches can indicate identity manipulation
-        matched_fields = kyc_result.get("matchedFields", {})
-        partial_matches = sum(1 for v in matched_fields.values() if v == "partial")
+        partial_matches = list(matched_fields.values()).count("partial")
         if partial_matches > 0:
             risk_score += 0.2
             risk_factors.append(f"Partial matches detected ({partial_matches} fields)")
@@ -264,17 +496,9 @@ class KYCMatchAgent(BaseAgent):
         if not doc_number:
             return False
             
-        # Basic format validation patterns
-        patterns = {
-            "passport": r"^[A-Z]{1,2}[0-9]{6,9}$",
-            "driver_license": r"^[A-Z0-9]{8,12}$",
-            "national_id": r"^[0-9]{9,12}$",
-            "ssn": r"^[0-9]{3}-[0-9]{2}-[0-9]{4}$"
-        }
-        
-        pattern = patterns.get(doc_type.lower())
-        if pattern:
-            return bool(re.match(pattern, doc_number.upper().replace(" ", "")))
+        pattern = _DOC_PATTERNS.get(doc_type.lower())
+        if pattern is not None:
+            return bool(pattern.match(doc_number.translate(_DOC_NORMALIZE)))
             
         return True  # Default to valid for unknown types
         
@@ -284,63 +508,31 @@ class KYCMatchAgent(BaseAgent):
         if not doc_number or len(doc_number) < 3:
             return False
             
-        # Basic Luhn algorithm for numeric documents
-        if doc_type.lower() in ["national_id", "ssn"] and doc_number.replace("-", "").isdigit():
-            digits = [int(d) for d in doc_number.replace("-", "")]
-            checksum = sum(digits[::2]) + sum((d*2 if d*2 < 10 else d*2-9) for d in digits[1::2])
+        # Basic Luhn algorithm for numeric documents, doubling every second digit from the right
+        digits = doc_number.replace("-", "")
+        if doc_type.lower() in ("national_id", "ssn") and digits.isascii() and digits.isdigit():
+            digits = digits.encode()
+            checksum = sum(digits[-1::-2].translate(_LUHN_DIGITS)) + sum(digits[-2::-2].translate(_LUHN_DOUBLED))
             return checksum % 10 == 0
             
         return True  # Default to valid
         
     def _verify_minimum_age(self, birthdate: str, minimum_age: int) -> bool:
         try:
-            birth_date = datetime.fromisoformat(birthdate.replace('Z', '+00:00'))
-            today = datetime.now()
-            age = (today - birth_date.replace(tzinfo=None)).days / 365.25
+            # Only the calendar date matters; any time or timezone suffix is ignored
+            birth_date = date.fromisoformat(birthdate[:10])
+            today = date.today()
+            age = today.year - birth_date.year - ((today.month, today.day) < (birth_date.month, birth_date.day))
             return age >= minimum_age
         except Exception:
             return False
             
     def _categorize_risk(self, risk_score: float) -> str:
-        if risk_score >= 0.8:
-            return "HIGH"
-        elif risk_score >= 0.5:
-            return "MEDIUM"
-        elif risk_score >= 0.2:
-            return "LOW"
-        else:
-            return "MINIMAL"
-            
-    def _generate_verification_recommendations(self, kyc_result: Dict[str, Any]) -> List[str]:
-        match_score = kyc_result.get("matchScore", 0.0)
+        return self._RISK_NAMES[bisect.bisect_right(self._RISK_CUTOFFS, risk_score)]
+        
+    def _generate_verification_recommendations(self, match_score: float) -> List[str]:
+        return list(self._VERIFICATION_RECOMMENDATIONS[bisect.bisect_right(self._RECOMMENDATION_CUTOFFS, match_score)])
         
-        if match_score < 0.3:
-            return [
-                "REJECT: Identity verification failed",
-                "Request alternative identification documents",
-                "Consider manual verification process",
-                "Flag account for enhanced monitoring"
-            ]
-        elif match_score < 0.6:
-            return [
-                "Request additional verification documents",
-                "Perform secondary identity checks",
-                "Limit account privileges until full verification",
-                "Monitor for suspicious activities"
-            ]
-        elif match_score < 0.8:
-            return [
-                "Consider requesting supplementary documentation",
-                "Apply standard monitoring procedures",
-                "Document verification attempt for audit trail"
-            ]
-        else:
-            return [
-                "APPROVE: Identity successfully verified",
-                "Proceed with normal account provisioning",
-                "Maintain standard monitoring protocols"
-            ]
-            
     def _generate_document_recommendations(self, validations: List[Dict[str, Any]]) -> List[str]:
         invalid_docs = [v for v in validations if not v.get("format_valid", False)]
         
@@ -357,20 +549,14 @@ class KYCMatchAgent(BaseAgent):
             ]
             
     def _generate_compliance_recommendations(self, compliance_results: Dict[str, Any]) -> List[str]:
-        recommendations = []
-        
-        failed_checks = compliance_results.get("failed_checks", [])
+        failed_checks = frozenset(compliance_results.get("failed_checks", ()))
         warnings = compliance_results.get("warnings", [])
         
-        if "identity_verification_missing" in failed_checks:
-            recommendations.append("Complete identity verification process immediately")
-            
-        if "document_validation_missing" in failed_checks:
-            recommendations.append("Validate customer identification documents")
-            
-        if "age_verification_failed" in failed_checks:
-            recommendations.append("Customer does not meet minimum age requirements")
-            
+        recommendations = [
+            recommendation for failed_check, recommendation in self._COMPLIANCE_RECOMMENDATIONS
+            if failed_check in failed_checks
+        ]
+        
         if warnings:
             recommendations.append("Address warning items for full compliance")
             
@@ -381,9 +567,8 @@ class KYCMatchAgent(BaseAgent):
         
     async def _get_agent_health(self) -> Dict[str, Any]:
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.camara_base_url}/health")
-                camara_status = response.status_code == 200
+            response = await self._get_client().get("/health")
+            camara_status = response.status_code == 200
         except Exception:
             camara_status = False
             
@@ -391,6 +576,7 @@ class KYCMatchAgent(BaseAgent):
             "camara_api_connection": camara_status,
             "supported_operations": [
                 "identity_verification",
+                "identity_verification_batch",
                 "document_validation",
                 "compliance_check"
             ]
@@ -1,12 +1,244 @@
-from typing import Dict, List, Any
+from typing import Dict, List, Any, Awaitable, Callable, Optional, Tuple, Union
 import asyncio
+from collections import OrderedDict
+import os
 import httpx
+import orjson
+from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta
+from functools import lru_cache
 import re
+import time
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional; the scoring kernels run as plain Python without it
+    njit = None
+
+try:
+    import hyperscan
+except ImportError:  # hyperscan is optional; the combined re scans are used without it
+    hyperscan = None
 
 from ..base.base_agent import BaseAgent
 
 
+# Distinct communication contents whose social engineering match counts are kept
+SOCIAL_ENGINEERING_CACHE_SIZE = 4096
+
+# Seconds a CAMARA scam check or pattern response stays valid, and the most responses kept
+CAMARA_CACHE_TTL = 30
+CAMARA_CACHE_MAX_ENTRIES = 8192
+
+
+def _combine_patterns(patterns: Tuple[re.Pattern, ...]) -> re.Pattern:
+    """Single alternation of a pattern group; capture group i is the group's i-th pattern"""
+    return re.compile("|".join(f"({pattern.pattern})" for pattern in patterns))
+
+
+def _count_matching_patterns(patterns: Tuple[re.Pattern, ...], combined: re.Pattern, text: str) -> int:
+    """Number of patterns in a group that occur in text, found with one scan of the combined regex"""
+    found = {match.lastindex for match in combined.finditer(text)}
+    if not found:
+        return 0
+    # A pattern can be hidden inside another alternative's match; only those need their own search
+    return len(found) + sum(
+        1 for i, pattern in enumerate(patterns, 1) if i not in found and pattern.search(text)
+    )
+
+
+# Social engineering indicators, matched against lowercased communication content
+_URGENCY_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r"urgent", r"immediately", r"expire", r"suspend", r"terminate",
+    r"within \d+ hours?", r"deadline", r"act now", r"time[- ]sensitive"
+))
+
+_AUTHORITY_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r"bank", r"police", r"government", r"irs", r"fbi", r"security team",
+    r"support team", r"microsoft", r"apple", r"google", r"amazon"
+))
+
+_FEAR_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r"account.{0,20}suspend", r"unauthorized.{0,20}access", r"security.{0,20}breach",
+    r"fraud.{0,20}detect", r"virus.{0,20}detect", r"hack", r"steal"
+))
+
+_INFORMATION_REQUEST_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r"password", r"pin", r"ssn", r"social security", r"credit card",
+    r"banking.{0,20}detail", r"account.{0,20}number", r"verify.{0,20}identity"
+))
+
+_TRUST_PATTERNS = tuple(re.compile(pattern) for pattern in (
+    r"verify your account", r"confirm your identity", r"security purposes",
+    r"protect your account", r"for your safety"
+))
+
+_URGENCY_COMBINED = _combine_patterns(_URGENCY_PATTERNS)
+_AUTHORITY_COMBINED = _combine_patterns(_AUTHORITY_PATTERNS)
+_FEAR_COMBINED = _combine_patterns(_FEAR_PATTERNS)
+_INFORMATION_REQUEST_COMBINED = _combine_patterns(_INFORMATION_REQUEST_PATTERNS)
+_TRUST_COMBINED = _combine_patterns(_TRUST_PATTERNS)
+
+# Pattern groups in reporting order: urgency, authority, fear, information requests, trust
+_SOCIAL_ENGINEERING_GROUPS = (
+    (_URGENCY_PATTERNS, _URGENCY_COMBINED),
+    (_AUTHORITY_PATTERNS, _AUTHORITY_COMBINED),
+    (_FEAR_PATTERNS, _FEAR_COMBINED),
+    (_INFORMATION_REQUEST_PATTERNS, _INFORMATION_REQUEST_COMBINED),
+    (_TRUST_PATTERNS, _TRUST_COMBINED)
+)
+# Group index of each pattern, numbered across all groups in order
+_PATTERN_GROUP_INDEX = tuple(
+    group for group, (patterns, _) in enumerate(_SOCIAL_ENGINEERING_GROUPS) for _ in patterns
+)
+
+
+def _build_hyperscan_database() -> Optional[Any]:
+    """Compile every social engineering pattern into one hyperscan database, or None if unavailable"""
+    if hyperscan is None:
+        return None
+    expressions = [pattern.pattern.encode() for patterns, _ in _SOCIAL_ENGINEERING_GROUPS for pattern in patterns]
+    database = hyperscan.Database()
+    try:
+        # SINGLEMATCH reports each pattern at most once, which is exactly the per-group count;
+        # CASELESS lets the scan run on the content as-is instead of a lowercased copy
+        database.compile(
+            expressions=expressions,
+            ids=list(range(len(expressions))),
+            elements=len(expressions),
+            flags=[hyperscan.HS_FLAG_SINGLEMATCH | hyperscan.HS_FLAG_UTF8 | hyperscan.HS_FLAG_CASELESS] * len(expressions)
+        )
+    except hyperscan.error:
+        return None
+    return database
+
+
+_HYPERSCAN_DATABASE = _build_hyperscan_database()
+
+
+@lru_cache(maxsize=SOCIAL_ENGINEERING_CACHE_SIZE)
+def _count_social_engineering_matches(content: Union[str, bytes]) -> Tuple[int, ...]:
+    """Number of distinct matching patterns per social engineering group, in group order"""
+    # Templated scam campaigns repeat the same content, so counts are cached per content
+    if _HYPERSCAN_DATABASE is None:
+        text = content.decode(errors="replace") if isinstance(content, bytes) else content
+        text = text.lower()
+        return tuple(_count_matching_patterns(patterns, combined, text) for patterns, combined in _SOCIAL_ENGINEERING_GROUPS)
+        
+    # UTF-8 mode requires valid input, so only text already in ASCII is scanned without re-encoding
+    if isinstance(content, str):
+        data = content.encode()
+    elif content.isascii():
+        data = content
+    else:
+        data = content.decode(errors="replace").encode()
+        
+    # One DFA pass over the content covers all groups at once
+    counts = [0] * len(_SOCIAL_ENGINEERING_GROUPS)
+    
+    def on_match(pattern_id: int, start: int, end: int, flags: int, context: Any) -> None:
+        counts[_PATTERN_GROUP_INDEX[pattern_id]] += 1
+        
+    _HYPERSCAN_DATABASE.scan(data, match_event_handler=on_match)
+    return tuple(counts)
+
+
+# Suspicious communication patterns, by bit of the _score_patterns flags
+SUSPICIOUS_PATTERN_NAMES = (
+    "excessive_call_volume",
+    "blast_calling_pattern",
+    "short_duration_calls",
+    "unusual_timing_patterns",
+    "sequential_number_dialing"
+)
+
+
+def _score_patterns_py(call_count: float, unique_targets: float, avg_duration: float,
+                       night_calls: float, sequential: bool) -> Tuple[float, int]:
+    """Anomaly score and SUSPICIOUS_PATTERN_NAMES bit flags of communication pattern counters"""
+    anomaly_score = 0.0
+    flags = 0
+    
+    # Excessive calls
+    if call_count > 50:
+        flags |= 1
+        anomaly_score += 0.3
+    # Blast patterns (many numbers called)
+    if unique_targets > 100:
+        flags |= 2
+        anomaly_score += 0.4
+    # Short duration calls (robocalls): less than 10 seconds average
+    if avg_duration < 10 and call_count > 10:
+        flags |= 4
+        anomaly_score += 0.2
+    # Non-business hours activity: more than 50% at night
+    if night_calls > call_count * 0.5:
+        flags |= 8
+        anomaly_score += 0.2
+    # Sequential number dialing
+    if sequential:
+        flags |= 16
+        anomaly_score += 0.3
+        
+    return min(anomaly_score, 1.0), flags
+
+
+def _score_threat_py(scam_confidence: float, anomaly_score: float,
+                     multiple_reports: bool, known_scammer: bool) -> float:
+    """Overall threat score from scam confidence, pattern anomaly score and context flags"""
+    total_score = scam_confidence * 0.4 + anomaly_score * 0.3
+    if multiple_reports:
+        total_score += 0.2
+    if known_scammer:
+        total_score += 0.5
+    return min(total_score, 1.0)
+
+
+_score_patterns = njit(cache=True)(_score_patterns_py) if njit else _score_patterns_py
+_score_threat = njit(cache=True)(_score_threat_py) if njit else _score_threat_py
+
+
+@dataclass(slots=True)
+class ScamSignalAnalysis:
+    """Threat level, summary and recommendations derived from a CAMARA scam check"""
+    threat_level: str
+    analysis: str
+    recommendations: List[str]
+
+
+@dataclass(slots=True)
+class SocialEngineeringAnalysis:
+    """Content tactics combined with CAMARA scam signals for one communication"""
+    detected: bool
+    tactics: List[str]
+    urgency_indicators: int
+    trust_indicators: int
+    risk_score: float
+    analysis: str
+    recommendations: List[str]
+
+
+@dataclass(slots=True)
+class PatternAnalysis:
+    """Suspicious communication patterns and anomaly score of a phone number"""
+    call_volume: float
+    unique_targets: float
+    average_duration: float
+    suspicious_patterns: List[str]
+    anomaly_score: float
+    pattern_confidence: float = 0.75
+
+
+@dataclass(slots=True)
+class ThreatAssessment:
+    """Overall threat level of a phone number and the factors behind it"""
+    level: str
+    score: float
+    factors: List[str]
+    urgency: str
+    recommendations: List[str]
+
+
 class ScamSignalAgent(BaseAgent):
     def __init__(self):
         super().__init__(
@@ -18,11 +250,44 @@ class ScamSignalAgent(BaseAgent):
         
         self.camara_base_url = "http://localhost:8001/camara"
         
+        # Pooled CAMARA client shared by all scam signal calls
+        self._client: Optional[httpx.AsyncClient] = None
+        
+        # (endpoint, phone_number, request details) -> (fetched_at, response body), oldest first;
+        # bodies are kept as bytes and parsed per caller so no two callers share a dict
+        self._camara_cache: OrderedDict[Tuple[Any, ...], Tuple[float, bytes]] = OrderedDict()
+        # Same key -> upstream call currently in flight
+        self._camara_inflight: Dict[Tuple[Any, ...], asyncio.Future] = {}
+        
     async def _initialize_agent(self) -> None:
         self.logger.info("Initializing Scam Signal Agent")
+        self._get_client()
         
     async def _cleanup_agent(self) -> None:
         self.logger.info("Cleaning up Scam Signal Agent")
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            
+    def _reset_agent(self) -> None:
+        """Drop cached CAMARA responses"""
+        self._camara_cache.clear()
+        self._camara_inflight.clear()
+        
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the pooled CAMARA client, creating it if needed"""
+        if self._client is None or self._client.is_closed:
+            # A co-located CAMARA server can be reached over a Unix socket, skipping the loopback TCP stack
+            self._client = httpx.AsyncClient(
+                base_url=self.camara_base_url,
+                transport=httpx.AsyncHTTPTransport(
+                    uds=os.getenv("CAMARA_UDS"),
+                    http2=True,
+                    limits=httpx.Limits(max_connections=100, max_keepalive_connections=20)
+                ),
+                timeout=30.0
+            )
+        return self._client
         
     async def execute_capability(self, capability_type: str, input_data: Dict[str, Any]) -> Dict[str, Any]:
         if capability_type == "scam_detection":
@@ -51,14 +316,16 @@ class ScamSignalAgent(BaseAgent):
                 "communicationData": communication_data
             }
             
-            async with httpx.AsyncClient() as client:
-                response = await client.post(
-                    f"{self.camara_base_url}/scam-signal/v1/check",
-                    json=scam_request
+            content = orjson.dumps(scam_request, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS)
+            scam_data = await self._cached_camara_call(
+                ("check", phone_number, content),
+                lambda: self._get_client().post(
+                    "/scam-signal/v1/check",
+                    content=content,
+                    headers={"content-type": "application/json"}
                 )
-                response.raise_for_status()
-                scam_data = response.json()
-                
+            )
+            
             # Analyze scam signals
             scam_analysis = self._analyze_scam_signals(scam_data, communication_data)
             
@@ -67,9 +334,9 @@ class ScamSignalAgent(BaseAgent):
                 "scam_detected": scam_data.get("scamDetected", False),
                 "scam_confidence": scam_data.get("confidence", 0.0),
                 "scam_indicators": scam_data.get("indicators", []),
-                "threat_level": scam_analysis["threat_level"],
-                "analysis": scam_analysis["analysis"],
-                "recommendations": scam_analysis["recommendations"],
+                "threat_level": scam_analysis.threat_level,
+                "analysis": scam_analysis.analysis,
+                "recommendations": scam_analysis.recommendations,
                 "confidence": 0.87
             }
             
@@ -95,12 +362,9 @@ class ScamSignalAgent(BaseAgent):
         additional_signals = {}
         if phone_number:
             try:
-                async with httpx.AsyncClient() as client:
-                    response = await client.get(
-                        f"{self.camara_base_url}/scam-signal/v1/signals/{phone_number}"
-                    )
-                    response.raise_for_status()
-                    additional_signals = response.json()
+                response = await self._get_client().get(f"/scam-signal/v1/signals/{phone_number}")
+                response.raise_for_status()
+                additional_signals = orjson.loads(response.content)
             except Exception:
                 pass
                 
@@ -109,14 +373,14 @@ class ScamSignalAgent(BaseAgent):
         return {
             "phone_number": phone_number,
             "communication_type": communication_type,
-            "social_engineering_detected": combined_analysis["detected"],
-            "tactics_identified": combined_analysis["tactics"],
-            "urgency_indicators": combined_analysis["urgency_indicators"],
-            "trust_exploitation": combined_analysis["trust_indicators"],
-            "risk_score": combined_analysis["risk_score"],
-            "analysis": combined_analysis["analysis"],
+            "social_engineering_detected": combined_analysis.detected,
+            "tactics_identified": combined_analysis.tactics,
+            "urgency_indicators": combined_analysis.urgency_indicators,
+            "trust_exploitation": combined_analysis.trust_indicators,
+            "risk_score": combined_analysis.risk_score,
+            "analysis": combined_analysis.analysis,
             "confidence": 0.83,
-            "recommendations": combined_analysis["recommendations"]
+            "recommendations": combined_analysis.recommendations
         }
         
     async def _analyze_communication_patterns(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -127,22 +391,22 @@ class ScamSignalAgent(BaseAgent):
         
         try:
             # Get communication pattern data
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    f"{self.camara_base_url}/scam-signal/v1/patterns/{phone_number}",
+            pattern_data = await self._cached_camara_call(
+                ("patterns", phone_number, time_window_hours),
+                lambda: self._get_client().get(
+                    f"/scam-signal/v1/patterns/{phone_number}",
                     params={"hours": time_window_hours}
                 )
-                response.raise_for_status()
-                pattern_data = response.json()
-                
+            )
+            
             pattern_analysis = self._analyze_patterns(pattern_data)
             
             return {
                 "phone_number": phone_number,
                 "time_window_hours": time_window_hours,
-                "communication_patterns": pattern_analysis,
-                "anomaly_score": pattern_analysis.get("anomaly_score", 0.0),
-                "suspicious_patterns": pattern_analysis.get("suspicious_patterns", []),
+                "communication_patterns": asdict(pattern_analysis),
+                "anomaly_score": pattern_analysis.anomaly_score,
+                "suspicious_patterns": pattern_analysis.suspicious_patterns,
                 "confidence": 0.80
             }
             
@@ -154,38 +418,70 @@ class ScamSignalAgent(BaseAgent):
                 "confidence": 0.0
             }
             
+    async def _cached_camara_call(self, key: Tuple[Any, ...],
+                                  request: Callable[[], Awaitable[httpx.Response]]) -> Dict[str, Any]:
+        """Make a CAMARA call, reusing a recent response for the same key"""
+        cached = self._camara_cache.get(key)
+        if cached is not None and time.monotonic() - cached[0] < CAMARA_CACHE_TTL:
+            return orjson.loads(cached[1])
+            
+        # Concurrent misses for the same key share one upstream call
+        task = self._camara_inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._fetch_and_cache(key, request))
+            self._camara_inflight[key] = task
+            task.add_done_callback(lambda _: self._camara_inflight.pop(key, None))
+            
+        # Shielded so one cancelled caller does not cancel the call for the others
+        return orjson.loads(await asyncio.shield(task))
+        
+    async def _fetch_and_cache(self, key: Tuple[Any, ...],
+                               request: Callable[[], Awaitable[httpx.Response]]) -> bytes:
+        """Make a CAMARA call and cache the response body; failures raise and are not cached"""
+        response = await request()
+        response.raise_for_status()
+        data = response.content
+        orjson.loads(data)  # Malformed bodies raise here and are not cached
+        
+        self._camara_cache[key] = (time.monotonic(), data)
+        self._camara_cache.move_to_end(key)
+        if len(self._camara_cache) > CAMARA_CACHE_MAX_ENTRIES:
+            self._camara_cache.popitem(last=False)
+        return data
+        
     async def _assess_threat_level(self, input_data: Dict[str, Any]) -> Dict[str, Any]:
         await self.validate_input(input_data, ["phone_number"])
         
         phone_number = input_data["phone_number"]
         context = input_data.get("context", {})
         
-        # Gather all available scam signal data
-        scam_result = await self._detect_scam({"phone_number": phone_number})
+        # Gather scam signal data and communication patterns concurrently;
+        # both report failures as error results rather than raising
+        scam_result, pattern_result = await asyncio.gather(
+            self._detect_scam({"phone_number": phone_number}),
+            self._analyze_communication_patterns({"phone_number": phone_number})
+        )
         
         if "error" in scam_result:
             return scam_result
             
-        # Get communication patterns
-        pattern_result = await self._analyze_communication_patterns({"phone_number": phone_number})
-        
         # Calculate comprehensive threat assessment
         threat_assessment = self._calculate_threat_level(scam_result, pattern_result, context)
         
         return {
             "phone_number": phone_number,
-            "overall_threat_level": threat_assessment["level"],
-            "threat_score": threat_assessment["score"],
-            "contributing_factors": threat_assessment["factors"],
+            "overall_threat_level": threat_assessment.level,
+            "threat_score": threat_assessment.score,
+            "contributing_factors": threat_assessment.factors,
             "scam_signals": scam_result,
             "pattern_analysis": pattern_result,
-            "urgency": threat_assessment["urgency"],
+            "urgency": threat_assessment.urgency,
             "confidence": 0.85,
-            "recommendations": threat_assessment["recommendations"]
+            "recommendations": threat_assessment.recommendations
         }
         
     def _analyze_scam_signals(self, scam_data: Dict[str, Any], 
-                            communication_data: Dict[str, Any]) -> Dict[str, Any]:
+                            communication_data: Dict[str, Any]) -> ScamSignalAnalysis:
         scam_detected = scam_data.get("scamDetected", False)
         confidence = scam_data.get("confidence", 0.0)
         indicators = scam_data.get("indicators", [])
@@ -209,47 +505,13 @@ class ScamSignalAgent(BaseAgent):
         # Generate recommendations
         recommendations = self._generate_scam_recommendations(threat_level, indicators)
         
-        return {
-            "threat_level": threat_level,
-            "analysis": analysis,
-            "recommendations": recommendations
-        }
-        
-    def _detect_social_engineering_tactics(self, content: str) -> Dict[str, Any]:
-        content_lower = content.lower()
-        
-        # Define social engineering indicators
-        urgency_patterns = [
-            r"urgent", r"immediately", r"expire", r"suspend", r"terminate",
-            r"within \d+ hours?", r"deadline", r"act now", r"time[- ]sensitive"
-        ]
-        
-        authority_patterns = [
-            r"bank", r"police", r"government", r"irs", r"fbi", r"security team",
-            r"support team", r"microsoft", r"apple", r"google", r"amazon"
-        ]
-        
-        fear_patterns = [
-            r"account.{0,20}suspend", r"unauthorized.{0,20}access", r"security.{0,20}breach",
-            r"fraud.{0,20}detect", r"virus.{0,20}detect", r"hack", r"steal"
-        ]
-        
-        information_requests = [
-            r"password", r"pin", r"ssn", r"social security", r"credit card",
-            r"banking.{0,20}detail", r"account.{0,20}number", r"verify.{0,20}identity"
-        ]
-        
-        trust_indicators = [
-            r"verify your account", r"confirm your identity", r"security purposes",
-            r"protect your account", r"for your safety"
-        ]
+        return ScamSignalAnalysis(threat_level, analysis, recommendations)
         
+    def _detect_social_engineering_tactics(self, content: Union[str, bytes]) -> Dict[str, Any]:
         # Count matches
-        urgency_matches = sum(1 for pattern in urgency_patterns if re.search(pattern, content_lower))
-        authority_matches = sum(1 for pattern in authority_patterns if re.search(pattern, content_lower))
-        fear_matches = sum(1 for pattern in fear_patterns if re.search(pattern, content_lower))
-        info_matches = sum(1 for pattern in information_requests if re.search(pattern, content_lower))
-        trust_matches = sum(1 for pattern in trust_indicators if re.search(pattern, content_lower))
+        urgency_matches, authority_matches, fear_matches, info_matches, trust_matches = (
+            _count_social_engineering_matches(content)
+        )
         
         # Identify tactics
         tactics = []
@@ -280,7 +542,7 @@ class ScamSignalAgent(BaseAgent):
         }
         
     def _combine_social_engineering_analysis(self, content_analysis: Dict[str, Any],
-                                           signals: Dict[str, Any]) -> Dict[str, Any]:
+                                           signals: Dict[str, Any]) -> SocialEngineeringAnalysis:
         tactics = content_analysis.get("tactics", [])
         base_risk = content_analysis.get("risk_score", 0.0)
         
@@ -305,93 +567,68 @@ class ScamSignalAgent(BaseAgent):
             
         recommendations = self._generate_social_engineering_recommendations(final_risk, tactics)
         
-        return {
-            "detected": detected,
-            "tactics": tactics,
-            "urgency_indicators": content_analysis.get("urgency_indicators", 0),
-            "trust_indicators": content_analysis.get("trust_indicators", 0),
-            "risk_score": final_risk,
-            "analysis": analysis,
-            "recommendations": recommendations
-        }
+        return SocialEngineeringAnalysis(
+            detected=detected,
+            tactics=tactics,
+            urgency_indicators=content_analysis.get("urgency_indicators", 0),
+            trust_indicators=content_analysis.get("trust_indicators", 0),
+            risk_score=final_risk,
+            analysis=analysis,
+            recommendations=recommendations
+        )
         
-    def _analyze_patterns(self, pattern_data: Dict[str, Any]) -> Dict[str, Any]:
+    def _analyze_patterns(self, pattern_data: Dict[str, Any]) -> PatternAnalysis:
         patterns = pattern_data.get("patterns", {})
         
-        suspicious_patterns = []
-        anomaly_score = 0.0
-        
-        # Check for suspicious call patterns
         call_count = patterns.get("callCount", 0)
-        if call_count > 50:  # Excessive calls
-            suspicious_patterns.append("excessive_call_volume")
-            anomaly_score += 0.3
-            
-        # Check for blast patterns (many numbers called)
         unique_targets = patterns.get("uniqueTargets", 0)
-        if unique_targets > 100:
-            suspicious_patterns.append("blast_calling_pattern")
-            anomaly_score += 0.4
-            
-        # Check for short duration calls (robocalls)
         avg_duration = patterns.get("averageCallDuration", 0)
-        if avg_duration < 10 and call_count > 10:  # Less than 10 seconds average
-            suspicious_patterns.append("short_duration_calls")
-            anomaly_score += 0.2
-            
-        # Check for non-business hours activity
         night_calls = patterns.get("nightTimeCalls", 0)
-        if night_calls > call_count * 0.5:  # More than 50% at night
-            suspicious_patterns.append("unusual_timing_patterns")
-            anomaly_score += 0.2
-            
-        # Check for sequential number dialing
-        if patterns.get("sequentialDialing", False):
-            suspicious_patterns.append("sequential_number_dialing")
-            anomaly_score += 0.3
-            
-        anomaly_score = min(anomaly_score, 1.0)
         
-        return {
-            "call_volume": call_count,
-            "unique_targets": unique_targets,
-            "average_duration": avg_duration,
-            "suspicious_patterns": suspicious_patterns,
-            "anomaly_score": anomaly_score,
-            "pattern_confidence": 0.75
-        }
+        anomaly_score, flags = _score_patterns(
+            call_count, unique_targets, avg_duration, night_calls,
+            bool(patterns.get("sequentialDialing", False))
+        )
+        suspicious_patterns = [name for bit, name in enumerate(SUSPICIOUS_PATTERN_NAMES) if flags >> bit & 1]
+        
+        return PatternAnalysis(
+            call_volume=call_count,
+            unique_targets=unique_targets,
+            average_duration=avg_duration,
+            suspicious_patterns=suspicious_patterns,
+            anomaly_score=anomaly_score
+        )
         
     def _calculate_threat_level(self, scam_result: Dict[str, Any], 
                               pattern_result: Dict[str, Any],
-                              context: Dict[str, Any]) -> Dict[str, Any]:
+                              context: Dict[str, Any]) -> ThreatAssessment:
         factors = []
-        total_score = 0.0
+        scam_confidence = 0.0
+        anomaly_score = 0.0
         
         # Scam detection factors
         if scam_result.get("scam_detected"):
             scam_confidence = scam_result.get("scam_confidence", 0.0)
-            total_score += scam_confidence * 0.4
             factors.append(f"Scam detected ({scam_confidence:.1%} confidence)")
             
         # Pattern analysis factors
         if not pattern_result.get("error"):
             anomaly_score = pattern_result.get("anomaly_score", 0.0)
-            total_score += anomaly_score * 0.3
             
             suspicious_patterns = pattern_result.get("suspicious_patterns", [])
             if suspicious_patterns:
                 factors.append(f"Suspicious communication patterns: {', '.join(suspicious_patterns)}")
                 
         # Context factors
-        if context.get("multiple_reports"):
-            total_score += 0.2
+        multiple_reports = bool(context.get("multiple_reports"))
+        if multiple_reports:
             factors.append("Multiple user reports received")
             
-        if context.get("known_scammer_number"):
-            total_score += 0.5
+        known_scammer = bool(context.get("known_scammer_number"))
+        if known_scammer:
             factors.append("Number appears on known scammer lists")
             
-        total_score = min(total_score, 1.0)
+        total_score = _score_threat(scam_confidence, anomaly_score, multiple_reports, known_scammer)
         
         # Determine threat level and urgency
         if total_score >= 0.8:
@@ -412,13 +649,13 @@ class ScamSignalAgent(BaseAgent):
             
         recommendations = self._generate_threat_recommendations(level, factors)
         
-        return {
-            "level": level,
-            "score": round(total_score, 3),
-            "factors": factors,
-            "urgency": urgency,
-            "recommendations": recommendations
-        }
+        return ThreatAssessment(
+            level=level,
+            score=round(total_score, 3),
+            factors=factors,
+            urgency=urgency,
+            recommendations=recommendations
+        )
         
     def _generate_scam_recommendations(self, threat_level: str, indicators: List[str]) -> List[str]:
         if threat_level == "HIGH":
@@ -499,9 +736,8 @@ class ScamSignalAgent(BaseAgent):
             
     async def _get_agent_health(self) -> Dict[str, Any]:
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(f"{self.camara_base_url}/health")
-                camara_status = response.status_code == 200
+            response = await self._get_client().get("/health")
+            camara_status = response.status_code == 200
         except Exception:
             camara_status = False
             
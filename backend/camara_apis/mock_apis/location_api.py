@@ -13,6 +13,20 @@ class LocationRequest(BaseModel):
     requested_accuracy: Optional[int] = Field(1000, description="Requested accuracy in meters")
 
 
+class BatchLocationRequest(BaseModel):
+    devices: List[Union[str, Dict[str, str]]] = Field(..., description="Device identifiers (phone numbers or device IDs)")
+    max_age: Optional[int] = Field(60, description="Maximum age in minutes for location data")
+    requested_accuracy: Optional[int] = Field(1000, description="Requested accuracy in meters")
+
+
+class SnapshotRequest(BaseModel):
+    phoneNumber: str = Field(..., description="Device phone number")
+    include: List[str] = Field(default_factory=lambda: ["current", "history"], description="Parts to return: current, history")
+    hours: int = Field(48, description="History window in hours")
+    min_interval_sec: int = Field(0, description="Minimum spacing between history points in seconds")
+    max_points: Optional[int] = Field(None, description="Maximum number of history points")
+
+
 class Coordinates(BaseModel):
     latitude: float = Field(..., ge=-90, le=90)
     longitude: float = Field(..., ge=-180, le=180)
@@ -34,6 +48,11 @@ class LocationResponse(BaseModel):
     metadata: Dict[str, Any] = Field(default_factory=dict)
 
 
+class BatchLocationResponse(BaseModel):
+    locations: List[LocationResponse]
+    total_devices: int
+
+
 class LocationHistory(BaseModel):
     device: str
     locations: List[Dict[str, Any]]
@@ -41,6 +60,11 @@ class LocationHistory(BaseModel):
     total_points: int
 
 
+class SnapshotResponse(BaseModel):
+    current: Optional[LocationResponse] = None
+    history: Optional[LocationHistory] = None
+
+
 router = APIRouter(prefix="/camara/location/v1", tags=["CAMARA Device Location API"])
 
 
@@ -291,8 +315,9 @@ class MockLocationAPI:
             metadata=metadata
         )
     
-    def get_location_history(self, device_id: str, hours_back: int = 24) -> LocationHistory:
-        """Get location history for a device"""
+    def get_location_history(self, device_id: str, hours_back: int = 24, min_interval_sec: int = 0,
+                             max_points: Optional[int] = None) -> LocationHistory:
+        """Get location history for a device, optionally downsampled for display"""
         history_data = self.location_history.get(device_id, [])
         
         # Filter by time range
@@ -302,6 +327,23 @@ class MockLocationAPI:
             if loc["timestamp"] > cutoff_time
         ]
         
+        # Drop points closer than min_interval_sec to the previously kept point
+        if min_interval_sec > 0 and filtered_history:
+            min_interval = timedelta(seconds=min_interval_sec)
+            spaced_history = [filtered_history[0]]
+            for loc in filtered_history[1:]:
+                if loc["timestamp"] - spaced_history[-1]["timestamp"] >= min_interval:
+                    spaced_history.append(loc)
+            filtered_history = spaced_history
+        
+        # Evenly decimate to at most max_points, keeping the first and last points
+        if max_points and len(filtered_history) > max_points:
+            if max_points == 1:
+                filtered_history = filtered_history[-1:]
+            else:
+                step = (len(filtered_history) - 1) / (max_points - 1)
+                filtered_history = [filtered_history[round(i * step)] for i in range(max_points)]
+        
         # Convert to response format
         locations = []
         for loc in filtered_history:
@@ -372,16 +414,63 @@ async def get_device_location(request: LocationRequest):
         raise HTTPException(status_code=500, detail=f"Location retrieval failed: {str(e)}")
 
 
+@router.post("/batch-retrieve", response_model=BatchLocationResponse)
+async def get_device_locations_batch(request: BatchLocationRequest):
+    """
+    Get current locations for multiple devices in one call
+    
+    Results are returned in the same order as the requested devices
+    """
+    try:
+        locations = []
+        for device_id in request.devices:
+            if isinstance(device_id, dict):
+                device_id = device_id.get("phoneNumber") or device_id.get("deviceId", "unknown")
+            
+            locations.append(mock_api.get_location(
+                device_id=device_id,
+                max_age_minutes=request.max_age,
+                requested_accuracy=request.requested_accuracy
+            ))
+        
+        return BatchLocationResponse(locations=locations, total_devices=len(locations))
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Batch location retrieval failed: {str(e)}")
+
+
 @router.get("/history/{device_id}", response_model=LocationHistory)
-async def get_device_location_history(device_id: str, hours_back: int = 24):
+async def get_device_location_history(device_id: str, hours_back: int = 24, min_interval_sec: int = 0,
+                                      max_points: Optional[int] = None):
     """Get location history for a device (debug endpoint)"""
     try:
-        history = mock_api.get_location_history(device_id, hours_back)
+        history = mock_api.get_location_history(device_id, hours_back, min_interval_sec, max_points)
         return history
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"History retrieval failed: {str(e)}")
 
 
+@router.post("/snapshot", response_model=SnapshotResponse)
+async def get_device_location_snapshot(request: SnapshotRequest):
+    """
+    Get current location and location history of a device in one call
+    
+    Only the parts listed in include are returned
+    """
+    try:
+        snapshot = SnapshotResponse()
+        if "current" in request.include:
+            snapshot.current = mock_api.get_location(device_id=request.phoneNumber)
+        if "history" in request.include:
+            snapshot.history = mock_api.get_location_history(
+                request.phoneNumber, request.hours, request.min_interval_sec, request.max_points
+            )
+        return snapshot
+    
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Snapshot retrieval failed: {str(e)}")
+
+
 @router.get("/cities")
 async def get_supported_cities():
     """Get list of supported cities (debug endpoint)"""
@@ -188,6 +188,21 @@ class ResourceRegistry:
         
         return True
     
+    def heartbeat_batch(self, heartbeats: List[Dict[str, Any]]) -> Dict[str, bool]:
+        """Process a batch of heartbeats sent together by an agent factory"""
+        results = {}
+        
+        for entry in heartbeats:
+            agent_id = entry.get("agent_id")
+            metrics = entry.get("metrics") or {}
+            numeric_metrics = {
+                key: value for key, value in metrics.items()
+                if isinstance(value, (int, float)) and not isinstance(value, bool)
+            }
+            results[agent_id] = self.heartbeat(agent_id, numeric_metrics or None)
+        
+        return results
+    
     def find_agents_by_capability(self, capability_type: CapabilityType, 
                                  requirements: Optional[Dict[str, Any]] = None) -> List[AgentResource]:
         """Find agents that have a specific capability"""